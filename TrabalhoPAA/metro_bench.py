@@ -0,0 +1,377 @@
+'''
+Trabalho PAA - Caixeiro Viajante
+Integrantes:
+
+Vinicius Dutra Goddard
+Victor Hugo Braz
+
+'''
+
+# Gerador de redes de metrô sintéticas e benchmark de escala dos solvers.
+import json
+import math
+import multiprocessing
+import os
+import platform
+import random
+import sys
+import tempfile
+import threading
+import time
+
+from metro_core import GraphSnapshot, MetroSolver
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+LINE_COLORS = ["yellow", "blue", "purple", "lightgreen", "pink", "olive", "sienna", "brown", "darkgreen", "indigo"]
+
+# Rede parecida com um metrô: linhas radiais que cruzam o centro (onde viram
+# baldeações), ramais saindo das pontas e linhas circulares. Estações novas
+# a menos de snap_distance de uma existente são a mesma estação (baldeação),
+# e toda linha nova reaproveita ao menos uma estação, então a rede é conexa.
+class MetroNetworkGenerator:
+    SPACING = 4.0
+
+    def __init__(self, seed=0, branch_probability=0.3, snap_distance=0.45):
+        self.random = random.Random(seed)
+        self.branch_probability = branch_probability
+        self.snap_distance = snap_distance * self.SPACING
+
+    def generate(self, station_count):
+        self.station_data = {}
+        self.line_data = []
+        self.grid = {}
+        self.target = station_count
+        line_count = max(3, round(math.sqrt(station_count) / 2))
+        ring_count = max(1, line_count // 6)
+        radial_count = line_count - ring_count
+        per_line = max(3, station_count // line_count)
+        radius = per_line * self.SPACING / 2
+
+        for k in range(radial_count):
+            angle = math.pi * k / radial_count + self.random.uniform(-0.2, 0.2)
+            path = self._radial(angle, radius)
+            stations = self._place_line(f"Linha {k + 1}", path)
+            if stations and self.random.random() < self.branch_probability:
+                self._branch(f"Linha {k + 1}B", stations, angle, radius / 2)
+        for k in range(ring_count):
+            ring_radius = radius * (0.3 + 0.5 * (k + 1) / (ring_count + 1))
+            self._place_line(f"Linha {radial_count + k + 1}", self._ring(ring_radius), closed=True)
+        # o que faltar vira ramais a partir de estações aleatórias
+        extra = 0
+        while len(self.station_data) < station_count and extra < 10 * station_count:
+            extra += 1
+            line_identifier, _, edge_connections = self.random.choice(self.line_data)
+            stations = [u for u, _ in edge_connections]
+            self._branch(f"{line_identifier}R{extra}", stations, self.random.uniform(0, 2 * math.pi), radius / 3)
+        return self.station_data, self.line_data
+
+    def write(self, station_count, stations_path, lines_path):
+        station_data, line_data = self.generate(station_count)
+        with open(stations_path, "w", encoding="utf-8") as f:
+            for name, (x_coordinate, y_coordinate) in station_data.items():
+                f.write(f"{name} {x_coordinate:.2f} {y_coordinate:.2f}\n")
+        with open(lines_path, "w", encoding="utf-8") as f:
+            for line_identifier, line_color, edge_connections in line_data:
+                f.write(f"{line_identifier},{line_color},{len(edge_connections) + 1}\n")
+                for station_a, station_b in edge_connections:
+                    f.write(f"{station_a};{station_b}\n")
+        return station_data, line_data
+
+    def _radial(self, angle, radius):
+        cos_a, sin_a = math.cos(angle), math.sin(angle)
+        wobble = self.random.uniform(0.02, 0.08) * radius
+        phase = self.random.uniform(0, 2 * math.pi)
+        steps = int(2 * radius / self.SPACING)
+        points = []
+        for i in range(steps + 1):
+            t = -radius + i * self.SPACING
+            offset = wobble * math.sin(phase + t / radius * math.pi) + self.random.gauss(0, 0.1 * self.SPACING)
+            points.append((t * cos_a - offset * sin_a, t * sin_a + offset * cos_a))
+        return points
+
+    def _ring(self, ring_radius):
+        steps = max(6, int(2 * math.pi * ring_radius / self.SPACING))
+        return [(ring_radius * math.cos(2 * math.pi * i / steps), ring_radius * math.sin(2 * math.pi * i / steps))
+                for i in range(steps)]
+
+    def _branch(self, line_identifier, stations, angle, length):
+        root = self.random.choice(stations[len(stations) * 2 // 3:] or stations)
+        x0, y0 = self.station_data[root]
+        angle += self.random.choice((-1, 1)) * self.random.uniform(math.pi / 6, math.pi / 3)
+        steps = max(2, int(length / self.SPACING))
+        path = [(x0 + i * self.SPACING * math.cos(angle), y0 + i * self.SPACING * math.sin(angle))
+                for i in range(1, steps + 1)]
+        self._place_line(line_identifier, path, root=root)
+
+    def _place_line(self, line_identifier, path, closed=False, root=None):
+        stations = [root] if root is not None else []
+        on_line = set(stations)
+        reused = root is not None
+        for x, y in path:
+            name = self._nearby(x, y)
+            if name is not None and name in on_line:
+                continue
+            if name is None:
+                if len(self.station_data) >= self.target:
+                    break
+                name = self._add_station(x, y)
+            else:
+                reused = True
+            stations.append(name)
+            on_line.add(name)
+        if stations and not reused and len(self.station_data) > len(stations):
+            # garante a conexão: a estação mais central da linha vira baldeação
+            center = min(range(len(stations)), key=lambda i: math.hypot(*self.station_data[stations[i]]))
+            stations.insert(center + 1, self._nearest_other(stations[center], stations))
+        if len(stations) < 2:
+            return stations
+        edge_connections = list(zip(stations, stations[1:]))
+        if closed and len(stations) > 2:
+            edge_connections.append((stations[-1], stations[0]))
+        color = LINE_COLORS[len(self.line_data) % len(LINE_COLORS)]
+        self.line_data.append((line_identifier, color, edge_connections))
+        return stations
+
+    def _add_station(self, x, y):
+        name = f"Estacao {len(self.station_data) + 1}"
+        self.station_data[name] = (x, y)
+        cell = (math.floor(x / self.SPACING), math.floor(y / self.SPACING))
+        self.grid.setdefault(cell, []).append(name)
+        return name
+
+    def _nearby(self, x, y):
+        cx, cy = math.floor(x / self.SPACING), math.floor(y / self.SPACING)
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                for name in self.grid.get((cx + dx, cy + dy), ()):
+                    sx, sy = self.station_data[name]
+                    if math.hypot(sx - x, sy - y) <= self.snap_distance:
+                        return name
+        return None
+
+    def _nearest_other(self, name, exclude):
+        x, y = self.station_data[name]
+        exclude = set(exclude)
+        return min((other for other in self.station_data if other not in exclude),
+                   key=lambda other: math.hypot(self.station_data[other][0] - x, self.station_data[other][1] - y))
+
+# (nome, problema, método do MetroSolver, parâmetros extras)
+BENCH_ALGORITHMS = [
+    ("forca_bruta", "A", "bruteForce_solve_longest_path", {}),
+    ("forca_bruta", "B", "bruteForce_solve_dominating_set", {}),
+    ("branch_and_bound", "A", "branchBound_solve_longest_path", {}),
+    ("branch_and_bound", "B", "branchBound_solve_dominating_set", {}),
+    ("bloco_corte", "A", "blockCut_solve_longest_path", {}),
+    ("heuristica", "A", "greedy_solve_longest_path", {}),
+    ("heuristica", "B", "greedy_solve_dominating_set", {}),
+]
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+# RSS atual (não o pico); None fora do Linux
+def _current_rss_kb():
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def _sample_rss(stop, samples, interval=0.01):
+    while not stop.wait(interval):
+        samples.append(_current_rss_kb())
+
+# Roda um caso num processo novo (spawn): o pico de memória é só deste caso e
+# a saída dos solvers (prints e arquivos) fica no diretório do benchmark.
+# O ru_maxrss do processo já inclui imports e a carga do grafo, então a
+# memória do solver é o maior RSS amostrado durante a chamada menos o RSS de
+# antes dela. Qualquer erro volta pela fila para o pai não esperar à toa.
+def _run_case(snapshot_path, method_name, params, time_budget, results):
+    try:
+        os.chdir(os.path.dirname(snapshot_path))
+        sys.stdout = open(os.devnull, "w")
+        start_time = time.perf_counter()
+        solver = MetroSolver.from_snapshot(GraphSnapshot.load(snapshot_path))
+        load_time = time.perf_counter() - start_time
+        report = {}
+        base_rss = _current_rss_kb()
+        samples = [base_rss]
+        stop = threading.Event()
+        sampler = threading.Thread(target=_sample_rss, args=(stop, samples), daemon=True)
+        if base_rss is not None:
+            sampler.start()
+        start_time = time.perf_counter()
+        try:
+            getattr(solver, method_name)(time_budget=time_budget, report=report, **params)
+        finally:
+            wall_time = time.perf_counter() - start_time
+            stop.set()
+            if sampler.is_alive():
+                sampler.join()
+        samples.append(_current_rss_kb())
+        results.put({
+            "load_time": load_time,
+            "wall_time": wall_time,
+            "peak_rss_kb": _peak_rss_kb(),
+            "solver_rss_kb": max(filter(None, samples)) - base_rss if base_rss is not None else None,
+            **report,
+        })
+    except Exception as error:
+        results.put({"error": f"{type(error).__name__}: {error}"})
+
+def run_benchmark(sizes, time_budget=10.0, seed=0, algorithms=None, workdir=None, hard_timeout=None):
+    workdir = workdir or tempfile.mkdtemp(prefix="metro_bench_")
+    selected = [entry for entry in BENCH_ALGORITHMS if not algorithms or f"{entry[0]}:{entry[1]}" in algorithms]
+    hard_timeout = hard_timeout or 3 * time_budget + 60
+    context = multiprocessing.get_context("spawn")
+    stopped = set()
+    results = []
+    for size in sizes:
+        case_dir = os.path.join(workdir, f"n{size}")
+        os.makedirs(case_dir, exist_ok=True)
+        stations_path = os.path.join(case_dir, "estacoes.txt")
+        lines_path = os.path.join(case_dir, "linhas.txt")
+        snapshot_path = os.path.join(case_dir, "metro.grafo")
+        station_data, line_data = MetroNetworkGenerator(seed).write(size, stations_path, lines_path)
+        GraphSnapshot.write(snapshot_path, station_data, line_data)
+        snapshot = GraphSnapshot.load(snapshot_path)
+        edge_count = snapshot.edge_count
+        snapshot.close()
+        print(f"\nn={size}: {len(station_data)} estações, {edge_count} arestas, {len(line_data)} linhas")
+
+        for algorithm, problem, method_name, params in selected:
+            entry = {"size": size, "stations": len(station_data), "edges": edge_count,
+                     "algorithm": algorithm, "problem": problem}
+            if (algorithm, problem) in stopped:
+                entry["status"] = "skipped"
+                results.append(entry)
+                continue
+            queue = context.Queue()
+            process = context.Process(target=_run_case,
+                                      args=(snapshot_path, method_name, params, time_budget, queue))
+            process.start()
+            try:
+                entry.update(queue.get(timeout=hard_timeout))
+                if "error" in entry:
+                    entry["status"] = "failed"
+                    stopped.add((algorithm, problem))
+                else:
+                    entry["status"] = "timeout" if entry.get("timed_out") else "ok"
+            except Exception:
+                # passou do limite sem responder (fase sem checagem de tempo) ou morreu
+                entry["status"] = "killed" if process.is_alive() else "failed"
+                stopped.add((algorithm, problem))
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            results.append(entry)
+            print(_format_row(entry))
+
+    _add_quality(results)
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "seed": seed,
+        "time_budget": time_budget,
+        "sizes": list(sizes),
+        "results": results,
+    }
+
+# Qualidade relativa à melhor solução encontrada para o mesmo tamanho e problema
+def _add_quality(results):
+    best = {}
+    for entry in results:
+        value = entry.get("value")
+        if value is None:
+            continue
+        key = (entry["size"], entry["problem"])
+        better = max if entry["problem"] == "A" else min
+        best[key] = better(best.get(key, value), value)
+    for entry in results:
+        value = entry.get("value")
+        reference = best.get((entry["size"], entry["problem"]))
+        if value is None or not reference or not value:
+            entry["quality"] = None
+        elif entry["problem"] == "A":
+            entry["quality"] = value / reference
+        else:
+            entry["quality"] = reference / value
+
+def _format_row(entry):
+    def fmt(value, pattern):
+        return pattern.format(value) if value is not None else "-"
+    return (f"{entry['size']:>6} {entry['algorithm']:>16}:{entry['problem']} {entry['status']:>8} "
+            f"{fmt(entry.get('wall_time'), '{:9.3f}s')} {fmt(entry.get('solver_rss_kb'), '{:>9}KB')} "
+            f"{fmt(entry.get('search_count'), '{:>12}')} {fmt(entry.get('value'), '{:>6}')} "
+            f"{fmt(entry.get('quality'), '{:6.3f}')}")
+
+def print_report(report):
+    print(f"\n{'n':>6} {'algoritmo':>18} {'status':>8} {'tempo':>10} {'memória':>11} {'chamadas':>12} "
+          f"{'valor':>6} {'qualid.':>6}")
+    for entry in report["results"]:
+        print(_format_row(entry))
+
+# Regressões em relação a um relatório anterior: mais lento que tolerance
+# vezes (ignorando casos abaixo de min_time), pior qualidade ou parou de escalar.
+def compare_reports(old, new, tolerance=1.5, min_time=0.05):
+    previous = {(e["size"], e["algorithm"], e["problem"]): e for e in old["results"]}
+    regressions = []
+    for entry in new["results"]:
+        key = (entry["size"], entry["algorithm"], entry["problem"])
+        before = previous.get(key)
+        if before is None:
+            continue
+        label = f"n={key[0]} {key[1]}:{key[2]}"
+        if before["status"] in ("ok", "timeout") and entry["status"] not in ("ok", "timeout"):
+            regressions.append(f"{label}: {before['status']} -> {entry['status']}")
+            continue
+        old_time, new_time = before.get("wall_time"), entry.get("wall_time")
+        if (before["status"] == entry["status"] == "ok" and old_time and new_time
+                and new_time > min_time and new_time > tolerance * old_time):
+            regressions.append(f"{label}: tempo {old_time:.3f}s -> {new_time:.3f}s")
+        old_quality, new_quality = before.get("quality"), entry.get("quality")
+        if old_quality is not None and new_quality is not None and new_quality < old_quality - 1e-9:
+            regressions.append(f"{label}: qualidade {old_quality:.3f} -> {new_quality:.3f}")
+    return regressions
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de escala dos solvers em redes sintéticas")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000, 5000, 20000, 50000])
+    parser.add_argument("--budget", type=float, default=10.0, help="orçamento de tempo por execução (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--algorithms", nargs="+", help="ex.: branch_and_bound:A heuristica:B")
+    parser.add_argument("--workdir", help="onde gravar as redes geradas")
+    parser.add_argument("--out", default="benchmark.json")
+    parser.add_argument("--compare", help="relatório anterior para detectar regressões")
+    parser.add_argument("--generate", type=int, metavar="N",
+                        help="só gera estacoes.txt/linhas.txt com N estações no --workdir")
+    args = parser.parse_args()
+
+    if args.generate:
+        workdir = args.workdir or "."
+        station_data, line_data = MetroNetworkGenerator(args.seed).write(
+            args.generate, os.path.join(workdir, "estacoes.txt"), os.path.join(workdir, "linhas.txt"))
+        print(f"{len(station_data)} estações e {len(line_data)} linhas gravadas em {workdir}")
+    else:
+        report = run_benchmark(args.sizes, args.budget, args.seed, args.algorithms, args.workdir)
+        print_report(report)
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nRelatório gravado em {args.out}")
+        if args.compare:
+            with open(args.compare, encoding="utf-8") as f:
+                regressions = compare_reports(json.load(f), report)
+            for regression in regressions:
+                print(f"REGRESSÃO {regression}")
+            if regressions:
+                sys.exit(1)
@@ -0,0 +1,3053 @@
+'''
+Trabalho PAA - Caixeiro Viajante
+Integrantes:
+
+Vinicius Dutra Goddard
+Victor Hugo Braz
+
+'''
+
+# Núcleo dos solvers: só biblioteca padrão no import. networkx e matplotlib
+# são carregados dentro das funções que montam ou desenham o nx.Graph.
+import contextlib
+import itertools
+import multiprocessing
+import os
+import queue
+import math
+import heapq
+import random
+from collections import OrderedDict, defaultdict, deque
+import threading
+import time
+import uuid
+import hashlib
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+
+class SolverCancelled(Exception):
+    pass
+
+class DeadlineExceeded(Exception):
+    pass
+
+# Sinal de cancelamento compartilhado entre quem pede e o solver em execução;
+# as buscas chamam check() a cada expansão (uma expansão custa bem mais que ler
+# o relógio e, em grafos grandes, pode levar milissegundos); laços de passos
+# baratos, como o kernel, chamam a cada CHECK_INTERVAL passos. Com deadline
+# (relógio monotônico), check() também avisa quando o orçamento acabou.
+class CancellationToken:
+    CHECK_INTERVAL = 256
+
+    def __init__(self, event=None, deadline=None):
+        self._event = event if event is not None else threading.Event()
+        self.deadline = deadline
+
+    @classmethod
+    def with_budget(cls, token, time_budget):
+        if time_budget is None:
+            return token
+        event = token._event if token is not None else None
+        deadline = time.monotonic() + time_budget
+        if token is not None and token.deadline is not None:
+            deadline = min(deadline, token.deadline)
+        return cls(event, deadline)
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise SolverCancelled("Execução cancelada.")
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise DeadlineExceeded("Tempo esgotado.")
+
+# Canal de eventos de uma execução (progresso e melhor solução até agora).
+# Os eventos ficam guardados, então quem assina tarde recebe o histórico;
+# assinantes dormem na Condition até chegar evento novo ou o canal fechar.
+class ProgressChannel:
+    def __init__(self):
+        self.events = []
+        self.closed = False
+        self._condition = threading.Condition()
+
+    def publish(self, kind, **data):
+        with self._condition:
+            self.events.append(dict(data, type=kind))
+            self._condition.notify_all()
+
+    def progress(self, percent):
+        self.publish("progress", progress=percent)
+
+    def incumbent(self, value, solution):
+        self.publish("incumbent", value=value, solution=solution)
+
+    def close(self, **data):
+        with self._condition:
+            self.events.append(dict(data, type="done"))
+            self.closed = True
+            self._condition.notify_all()
+
+    # gera os eventos a partir de start; None quando passa timeout sem novidade
+    def subscribe(self, start=0, timeout=15.0):
+        index = start
+        while True:
+            with self._condition:
+                if index >= len(self.events) and not self.closed:
+                    self._condition.wait(timeout)
+                pending = self.events[index:]
+                closed = self.closed
+            if not pending:
+                if closed:
+                    return
+                yield None
+                continue
+            index += len(pending)
+            for event in pending:
+                yield event
+
+# Métricas estruturadas de uma execução: nós expandidos, podas por motivo,
+# melhorias do incumbente (com o instante desde o início) e tempo por fase.
+# phase() fecha a fase anterior, então as fases não precisam de aninhamento.
+class SolverMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.nodes_expanded = 0
+        self.prunes = defaultdict(int)
+        self.incumbents = []
+        self.phases = defaultdict(float)
+        self._current = None
+
+    def phase(self, name):
+        now = time.perf_counter()
+        if self._current is not None:
+            current_name, since = self._current
+            self.phases[current_name] += now - since
+        self._current = (name, now) if name else None
+
+    def prune(self, reason, count=1):
+        if count:
+            self.prunes[reason] += count
+
+    def incumbent(self, value):
+        self.incumbents.append((time.perf_counter() - self.started, value))
+
+    def to_dict(self):
+        self.phase(None)
+        return {
+            "nodes_expanded": self.nodes_expanded,
+            "prunes": dict(self.prunes),
+            "incumbents": [{"time": round(t, 6), "value": value} for t, value in self.incumbents],
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "elapsed": round(time.perf_counter() - self.started, 6),
+        }
+
+# Checkpoint em disco (JSON) de uma busca exata: fronteira (pilha de frames),
+# incumbente e contadores. due() diz se já passou interval segundos desde a
+# última gravação; a gravação é atômica (temporário + rename). O cabeçalho
+# (solver, layout do grafo, parâmetros e formato) evita retomar a busca errada.
+# Bitmasks vão como hex: o json recusa int com mais de 4300 dígitos decimais,
+# o que uma máscara passa a partir de ~14,3 mil estações.
+class SearchCheckpoint:
+    FORMAT = 2
+
+    def __init__(self, path, solver, compact, params=None, interval=60.0):
+        self.path = path
+        self.header = {"solver": solver, "graph": compact.layout_fingerprint(), "params": params or {},
+                       "format": self.FORMAT}
+        self.interval = interval
+        self.last_save = time.monotonic()
+        self.saves = 0
+
+    def due(self):
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, state):
+        # nome temporário único: duas gravações ao mesmo tempo não apagam o arquivo uma da outra
+        tmp_path = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"header": self.header, "state": state}, f)
+        os.replace(tmp_path, self.path)
+        self.last_save = time.monotonic()
+        self.saves += 1
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        if data.get("header") != self.header:
+            print(f"Checkpoint {self.path} é de outra busca; começando do zero.")
+            return None
+        print(f"Retomando do checkpoint {self.path}")
+        return data["state"]
+
+    def clear(self):
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(self.path)
+
+    @staticmethod
+    def pack_mask(mask):
+        return None if mask is None else format(mask, "x")
+
+    @staticmethod
+    def unpack_mask(text):
+        return None if text is None else int(text, 16)
+
+# Representação compacta do grafo: estações viram ids inteiros e as
+# vizinhanças viram bitmasks (int), montada uma única vez por grafo.
+# Os nomes só são recuperados na hora de escrever os resultados.
+# As bitmasks somam O(N²) bits (uns 350 MB com 50 mil estações) e só o
+# conjunto dominante e alguns limites usam, então saem no primeiro acesso.
+class CompactGraph:
+    def __init__(self, names, neighbor_rows):
+        self.names = list(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.node_count = len(self.names)
+        self.adj = [list(row) for row in neighbor_rows]
+        self.degree = [len(row) for row in self.adj]
+        self._neighbor_mask = None
+        self._closed_mask = None
+        self.full_mask = (1 << self.node_count) - 1
+
+    @property
+    def neighbor_mask(self):
+        if self._neighbor_mask is None:
+            self._build_masks()
+        return self._neighbor_mask
+
+    @property
+    def closed_mask(self):
+        if self._closed_mask is None:
+            self._build_masks()
+        return self._closed_mask
+
+    def _build_masks(self):
+        neighbor_mask = []
+        closed_mask = []
+        for i, row in enumerate(self.adj):
+            mask = 0
+            for j in row:
+                mask |= 1 << j
+            neighbor_mask.append(mask)
+            closed_mask.append(mask | (1 << i))
+        self._neighbor_mask, self._closed_mask = neighbor_mask, closed_mask
+
+    @classmethod
+    def from_networkx(cls, graph):
+        names = list(graph.nodes())
+        index = {name: i for i, name in enumerate(names)}
+        rows = [[index[nbr] for nbr in graph.neighbors(name)] for name in names]
+        return cls(names, rows)
+
+    def permuted(self, order):
+        # Reindexa o grafo: o vértice order[k] passa a ter id k
+        new_id = [0] * self.node_count
+        for k, old in enumerate(order):
+            new_id[old] = k
+        rows = [[new_id[j] for j in self.adj[old]] for old in order]
+        return CompactGraph([self.names[old] for old in order], rows)
+
+    def by_degree_desc(self):
+        # Mesma ordem de sorted(graph.nodes(), key=graph.degree, reverse=True)
+        return sorted(range(self.node_count), key=self.degree.__getitem__, reverse=True)
+
+    def by_name(self):
+        return sorted(range(self.node_count), key=self.names.__getitem__)
+
+    def to_names(self, ids):
+        names = self.names
+        return [names[i] for i in ids]
+
+    def mask_to_ids(self, mask):
+        ids = []
+        while mask:
+            low = mask & -mask
+            ids.append(low.bit_length() - 1)
+            mask ^= low
+        return ids
+
+    def mask_to_names(self, mask):
+        return self.to_names(self.mask_to_ids(mask))
+
+    def ids_to_mask(self, ids):
+        bits = bytearray((self.node_count + 7) // 8)
+        for i in ids:
+            bits[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(bits, "little")
+
+    # hash dos ids e da ordem das vizinhanças (que decide a ordem das buscas)
+    def layout_fingerprint(self):
+        return hashlib.sha256(json.dumps([self.names, self.adj]).encode("utf-8")).hexdigest()
+
+    # Componentes biconexas (blocos) via Tarjan iterativo, como bitmasks.
+    # Vértices isolados viram blocos unitários.
+    def biconnected_blocks(self):
+        adj = self.adj
+        disc = [-1] * self.node_count
+        low = [0] * self.node_count
+        blocks = []
+        counter = 0
+        for root in range(self.node_count):
+            if disc[root] != -1:
+                continue
+            disc[root] = low[root] = counter
+            counter += 1
+            if not adj[root]:
+                blocks.append(1 << root)
+                continue
+            vertex_stack = [root]
+            stack = [[root, -1, 0]]
+            while stack:
+                frame = stack[-1]
+                v, parent, i = frame
+                if i < len(adj[v]):
+                    frame[2] += 1
+                    w = adj[v][i]
+                    if disc[w] == -1:
+                        disc[w] = low[w] = counter
+                        counter += 1
+                        vertex_stack.append(w)
+                        stack.append([w, v, 0])
+                    elif w != parent and disc[w] < low[v]:
+                        low[v] = disc[w]
+                    continue
+                stack.pop()
+                if not stack:
+                    continue
+                u = stack[-1][0]
+                if low[v] < low[u]:
+                    low[u] = low[v]
+                if low[v] >= disc[u]:
+                    mask = 1 << u
+                    while True:
+                        x = vertex_stack.pop()
+                        mask |= 1 << x
+                        if x == v:
+                            break
+                    blocks.append(mask)
+        return blocks
+
+    # Limite superior para o caminho mais longo: o tamanho da maior componente
+    # conexa, descontando as folhas além das duas que podem ser as pontas.
+    def longest_path_upper_bound(self):
+        seen = bytearray(self.node_count)
+        best = 0
+        for root in range(self.node_count):
+            if seen[root]:
+                continue
+            seen[root] = 1
+            comp = [root]
+            for v in comp:
+                for w in self.adj[v]:
+                    if not seen[w]:
+                        seen[w] = 1
+                        comp.append(w)
+            leaves = sum(1 for v in comp if self.degree[v] == 1)
+            best = max(best, len(comp) - max(0, leaves - 2))
+        return best
+
+# Componentes dos vértices livres vistas da ponta de um caminho, mantidas de
+# forma incremental (enter/leave em ordem de pilha, desfeitos por um log).
+# Cada vértice livre guarda o rótulo da sua componente; por rótulo ficam o
+# tamanho e o número de becos sem saída (grau residual <= 1, contando a ponta,
+# e só um deles pode ser o fim do caminho). Quando c entra no caminho a
+# componente dele só é refeita se c tem dois ou mais vizinhos livres: uma BFS
+# por vizinho, intercaladas, até sobrar um único grupo ativo. O custo é o das
+# partes que se separam, e só elas ganham rótulo novo.
+class ResidualComponents:
+    def __init__(self, compact, universe=None):
+        n = compact.node_count
+        self.adj = compact.adj
+        self.blocked = bytearray(b"\x01") * n
+        self.rdeg = [0] * n
+        self.label = [0] * n
+        self.mark = [-1] * n
+        self.size = []
+        self.dead = []
+        self.path = []
+        self._log = []
+        self._stamp = 0
+        self._members = ()
+        self.reset(range(n) if universe is None else universe)
+
+    # troca o conjunto de vértices livres (com o caminho vazio)
+    def reset(self, universe):
+        adj, blocked, rdeg, label = self.adj, self.blocked, self.rdeg, self.label
+        for v in self._members:
+            blocked[v] = 1
+        members = list(universe)
+        for v in members:
+            blocked[v] = 0
+        for v in members:
+            rdeg[v] = sum(1 for w in adj[v] if not blocked[w])
+        self.size = []
+        self.dead = []
+        seen = set()
+        for root in members:
+            if root in seen:
+                continue
+            lab = len(self.size)
+            seen.add(root)
+            stack = [root]
+            count = dead = 0
+            while stack:
+                v = stack.pop()
+                label[v] = lab
+                count += 1
+                if rdeg[v] <= 1:
+                    dead += 1
+                for w in adj[v]:
+                    if not blocked[w] and w not in seen:
+                        seen.add(w)
+                        stack.append(w)
+            self.size.append(count)
+            self.dead.append(dead)
+        self._members = members
+
+    # c entra no caminho e vira a ponta. Se a componente de c, sem ele, não tem
+    # mais que floor vértices, quem chamou vai podar c e a divisão é pulada.
+    def enter(self, c, floor=-1):
+        adj, blocked, rdeg, label, size, dead = self.adj, self.blocked, self.rdeg, self.label, self.size, self.dead
+        lab = label[c]
+        blocked[c] = 1
+        size[lab] -= 1
+        if rdeg[c] <= 1:
+            dead[lab] -= 1
+        dropped = []
+        if self.path:
+            # os vizinhos da ponta anterior deixam de contar com ela
+            for w in adj[self.path[-1]]:
+                if not blocked[w]:
+                    rdeg[w] -= 1
+                    if rdeg[w] == 1:
+                        dead[label[w]] += 1
+                    dropped.append(w)
+        self.path.append(c)
+        pieces = None
+        if size[lab] > floor:
+            seeds = [w for w in adj[c] if not blocked[w]]
+            if len(seeds) > 1:
+                pieces = self._split(lab, seeds)
+        self._log.append((lab, dropped, pieces))
+
+    def leave(self):
+        c = self.path.pop()
+        lab, dropped, pieces = self._log.pop()
+        label, size, dead, rdeg = self.label, self.size, self.dead, self.rdeg
+        if pieces:
+            for vertices in reversed(pieces):
+                for v in vertices:
+                    label[v] = lab
+                size[lab] += size.pop()
+                dead[lab] += dead.pop()
+        for w in dropped:
+            if rdeg[w] == 1:
+                dead[label[w]] -= 1
+            rdeg[w] += 1
+        self.blocked[c] = 0
+        size[lab] += 1
+        if rdeg[c] <= 1:
+            dead[lab] += 1
+
+    # quantos vértices um caminho ainda pode ganhar entrando na componente de w
+    def extension(self, w):
+        lab = self.label[w]
+        dead = self.dead[lab]
+        return self.size[lab] - dead + 1 if dead > 1 else self.size[lab]
+
+    # maior extensão entre as componentes vizinhas da ponta (0: beco sem saída)
+    def reach(self):
+        blocked = self.blocked
+        return max((self.extension(w) for w in self.adj[self.path[-1]] if not blocked[w]), default=0)
+
+    # Separa a componente lab sem a nova ponta. Grupos que se encontram se
+    # fundem (o menor entra no maior); um grupo cuja fila esvazia sozinho é
+    # uma componente à parte. Devolve os vértices de cada parte relabelada.
+    def _split(self, lab, seeds):
+        adj, blocked, mark = self.adj, self.blocked, self.mark
+        base = self._stamp
+        self._stamp += len(seeds)
+        group = list(range(len(seeds)))
+        queues = []
+        members = []
+        for i, s in enumerate(seeds):
+            mark[s] = base + i
+            queues.append(deque([s]))
+            members.append([s])
+        finished = []
+        done = bytearray(len(seeds))
+        order = deque(range(len(seeds)))
+        active = len(seeds)
+        while active > 1:
+            g = order.popleft()
+            if group[g] != g or done[g]:
+                continue
+            q = queues[g]
+            if not q:
+                done[g] = 1
+                finished.append(g)
+                active -= 1
+                continue
+            v = q.popleft()
+            for w in adj[v]:
+                if blocked[w]:
+                    continue
+                m = mark[w] - base
+                if m < 0:
+                    mark[w] = base + g
+                    q.append(w)
+                    members[g].append(w)
+                    continue
+                while group[m] != m:
+                    group[m] = group[group[m]]
+                    m = group[m]
+                if m != g:
+                    if len(members[m]) > len(members[g]):
+                        g, m = m, g
+                    group[m] = g
+                    queues[g].extend(queues[m])
+                    members[g].extend(members[m])
+                    q = queues[g]
+                    active -= 1
+            order.append(g)
+
+        label, rdeg, size, dead = self.label, self.rdeg, self.size, self.dead
+        pieces = []
+        for g in finished:
+            vertices = members[g]
+            new_label = len(size)
+            piece_dead = 0
+            for v in vertices:
+                label[v] = new_label
+                if rdeg[v] <= 1:
+                    piece_dead += 1
+            size.append(len(vertices))
+            dead.append(piece_dead)
+            size[lab] -= len(vertices)
+            dead[lab] -= piece_dead
+            pieces.append(vertices)
+        return pieces
+
+# Quadros pré-alocados das buscas em profundidade iterativas (pilha explícita
+# no lugar da recursão, sem limite de recursão nem custo de chamada por nó).
+class _PathFrame:
+    __slots__ = ("node", "index", "key", "check")
+
+class _DomFrame:
+    __slots__ = ("chosen", "size", "dominated", "excluded", "candidates", "index")
+
+# Tabela de transposição com memória limitada (LRU) para estados da busca
+# do caminho mais longo. A chave é um hash Zobrist do conjunto visitado mais
+# o nó final; um segundo hash Zobrist, independente, confirma o estado no
+# lugar da máscara visitada (que custava N bits por entrada). Toda entrada tem
+# o mesmo tamanho, ~ENTRY_BYTES, então max_entries limita a memória.
+# Desligada por padrão: nas redes geradas e em Paris quase não há acertos.
+class TranspositionTable:
+    ENTRY_BYTES = 260
+
+    def __init__(self, node_count, max_entries=200_000, seed=0):
+        rng = random.Random(seed)
+        self.visit_keys = [rng.getrandbits(64) for _ in range(node_count)]
+        self.end_keys = [rng.getrandbits(64) for _ in range(node_count)]
+        self.check_visit_keys = [rng.getrandbits(64) for _ in range(node_count)]
+        self.check_end_keys = [rng.getrandbits(64) for _ in range(node_count)]
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # limite superior já provado para a extensão restante do estado, ou None
+    def lookup(self, key, check):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != check:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def store(self, key, check, bound):
+        entries = self.entries
+        if key in entries:
+            entries.move_to_end(key)
+        elif len(entries) >= self.max_entries:
+            entries.popitem(last=False)
+            self.evictions += 1
+        entries[key] = (check, bound)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "evictions": self.evictions,
+        }
+
+# Busca em profundidade do caminho mais longo a partir de um nó inicial.
+# O incumbente (best_len) pode ser compartilhado entre processos via shared_best.
+class LongestPathSearch:
+    SYNC_INTERVAL = 512
+
+    def __init__(self, compact, shared_best=None, table_size=0, cancel_token=None, progress=None, metrics=None):
+        self.compact = compact
+        self.cancel_token = cancel_token
+        self.progress = progress
+        self.metrics = metrics
+        self.adj = compact.adj
+        self.node_count = compact.node_count
+        self.shared_best = shared_best
+        self.table = TranspositionTable(compact.node_count, table_size) if table_size else None
+        self.best_len = 0
+        self.best_path = []
+        self.search_count = 0
+        self.table_prunes = 0
+        self.bound_prunes = 0
+        self._path = []
+        self._frames = [_PathFrame() for _ in range(compact.node_count)]
+        self._reach = ResidualComponents(compact)
+        self._visited_hash = 0
+        self._visited_check = 0
+        # on_checkpoint(fronteira) é chamado num ponto consistente da busca
+        # quando checkpoint.due(); a fronteira volta por run_from(start, frontier)
+        self.checkpoint = None
+        self.on_checkpoint = None
+        self._checkpoint_due = False
+
+    def run_from(self, start, frontier=None):
+        self._sync()
+        if frontier is None:
+            self._dfs_branch(start)
+        else:
+            self._dfs_branch(None, self._restore(frontier))
+
+    # caminho atual e o próximo vizinho de cada frame da pilha
+    def frontier(self, depth):
+        frames = self._frames
+        return {"path": list(self._path), "frames": [frames[i].index for i in range(depth + 1)]}
+
+    def _restore(self, frontier):
+        table = self.table
+        self._path[:] = frontier["path"]
+        self._visited_hash = self._visited_check = 0
+        for depth, (node, index) in enumerate(zip(frontier["path"], frontier["frames"])):
+            self._reach.enter(node)
+            frame = self._frames[depth]
+            frame.node = node
+            frame.index = index
+            frame.key = frame.check = None
+            if table is not None:
+                self._visited_hash ^= table.visit_keys[node]
+                self._visited_check ^= table.check_visit_keys[node]
+                frame.key = self._visited_hash ^ table.end_keys[node]
+                frame.check = self._visited_check ^ table.check_end_keys[node]
+        return len(frontier["frames"]) - 1
+
+    def _sync(self):
+        shared = self.shared_best
+        if shared is None:
+            return
+        with shared.get_lock():
+            if self.best_len > shared.value:
+                shared.value = self.best_len
+            else:
+                self.best_len = shared.value
+
+    def _dfs_branch(self, start, depth=-1):
+        adj = self.adj
+        frames = self._frames
+        path_stack = self._path
+        table = self.table
+        reach = self._reach
+        blocked = reach.blocked
+        node = start if depth < 0 else None
+        while True:
+            if node is not None:
+                self.search_count += 1
+                if self.cancel_token is not None:
+                    self.cancel_token.check()
+                if self.search_count % self.SYNC_INTERVAL == 0:
+                    self._sync()
+                    if self.checkpoint is not None and self.checkpoint.due():
+                        self._checkpoint_due = True
+                path_stack.append(node)
+
+                key = check = None
+                if table is not None:
+                    self._visited_hash ^= table.visit_keys[node]
+                    self._visited_check ^= table.check_visit_keys[node]
+                    key = self._visited_hash ^ table.end_keys[node]
+                    check = self._visited_check ^ table.check_end_keys[node]
+                    bound = table.lookup(key, check)
+                    # mesmo estado (nó final, visitados) já explorado por outra ordem
+                    if bound is not None and len(path_stack) + bound <= self.best_len:
+                        self.table_prunes += 1
+                        self._leave(node)
+                        if depth < 0:
+                            return
+                        node = None
+
+            if node is not None:
+                reach.enter(node, self.best_len - len(path_stack))
+                extension = reach.reach()
+                depth += 1
+                frame = frames[depth]
+                frame.node = node
+                frame.index = 0
+                frame.key = key
+                frame.check = check
+                if not extension:
+                    if len(path_stack) > self.best_len:
+                        self.best_len = len(path_stack)
+                        self.best_path = list(path_stack)
+                        if self.metrics is not None:
+                            self.metrics.incumbent(self.best_len)
+                        if self.progress is not None:
+                            self.progress.incumbent(self.best_len, self.compact.to_names(self.best_path))
+                        # depois de publicar: _sync pode trazer um best_len maior de outro processo
+                        self._sync()
+                    frame.index = len(adj[node])
+                elif len(path_stack) + extension <= self.best_len:
+                    self.bound_prunes += 1
+                    frame.index = len(adj[node])
+                node = None
+
+            if self._checkpoint_due:
+                self._checkpoint_due = False
+                self.on_checkpoint(self.frontier(depth))
+            frame = frames[depth]
+            row = adj[frame.node]
+            while frame.index < len(row):
+                nbr = row[frame.index]
+                frame.index += 1
+                if not blocked[nbr] and len(path_stack) + reach.extension(nbr) > self.best_len:
+                    node = nbr
+                    break
+            if node is not None:
+                continue
+
+            if table is not None:
+                # toda extensão melhor que o incumbente teria sido encontrada aqui
+                table.store(frame.key, frame.check, self.best_len - len(path_stack))
+            reach.leave()
+            self._leave(frame.node)
+            depth -= 1
+            if depth < 0:
+                return
+
+    def _leave(self, node):
+        self._path.pop()
+        if self.table is not None:
+            self._visited_hash ^= self.table.visit_keys[node]
+            self._visited_check ^= self.table.check_visit_keys[node]
+
+# Caminho mais longo pela árvore bloco-corte: um caminho simples atravessa
+# cada bloco uma única vez, entrando e saindo por vértices de corte. Cada
+# bloco é resolvido isoladamente (busca com bônus nos vértices de corte que
+# levam a subárvores) e os resultados são combinados de baixo para cima.
+class BlockCutLongestPath:
+    def __init__(self, compact, cancel_token=None, progress=None, metrics=None):
+        self.compact = compact
+        self.cancel_token = cancel_token
+        self.progress = progress
+        self.metrics = metrics
+        self.search_count = 0
+        self.bound_prunes = 0
+        self.largest_block = 0
+        self.blocks_done = 0
+        self.best_path = []
+        self.reach = ResidualComponents(compact, ())
+
+    # initial_path é um incumbente já conhecido (o do guloso): só caminhos
+    # mais longos que ele são procurados, e é ele que sobra se o prazo acabar
+    def solve(self, initial_path=()):
+        cg = self.compact
+        blocks = cg.biconnected_blocks()
+        vertex_blocks = [[] for _ in range(cg.node_count)]
+        for b, mask in enumerate(blocks):
+            for v in cg.mask_to_ids(mask):
+                vertex_blocks[v].append(b)
+            self.largest_block = max(self.largest_block, mask.bit_count())
+
+        best_path = self.best_path = list(initial_path)
+        best_len = len(best_path)
+        seen = [False] * len(blocks)
+        for root in range(len(blocks)):
+            if seen[root]:
+                continue
+            # percorre a árvore bloco-corte (BFS) a partir de root
+            seen[root] = True
+            queue = [(root, None)]
+            child_blocks = {}
+            for b, parent_cut in queue:
+                for c in cg.mask_to_ids(blocks[b]):
+                    if c == parent_cut or len(vertex_blocks[c]) < 2:
+                        continue
+                    children = [b2 for b2 in vertex_blocks[c] if not seen[b2]]
+                    for b2 in children:
+                        seen[b2] = True
+                        queue.append((b2, c))
+                    child_blocks[c] = children
+
+            down = {}
+            down_cut = {}
+            for b, parent_cut in reversed(queue):
+                self.blocks_done += 1
+                if self.progress is not None:
+                    self.progress.progress(round(100 * self.blocks_done / len(blocks)))
+                bonus = {}
+                tails = {}
+                for c in cg.mask_to_ids(blocks[b]):
+                    if c == parent_cut or c not in child_blocks:
+                        continue
+                    ranked = sorted((down[b2] for b2 in child_blocks[c]), key=len, reverse=True)
+                    tails[c] = ranked[0] if ranked else [c]
+                    bonus[c] = len(tails[c]) - 1
+                    # caminho cujo ponto mais alto é o corte c: duas subárvores filhas
+                    if len(ranked) > 1 and len(ranked[0]) + len(ranked[1]) - 1 > best_len:
+                        best_path = ranked[0][::-1] + ranked[1][1:]
+                        best_len = len(best_path)
+                        self._improve(best_path)
+                down_cut.update(tails)
+
+                if parent_cut is not None:
+                    block_path = self._block_search(blocks[b], [parent_cut], bonus, 0)
+                    down[b] = self._expand(block_path, tails)
+
+                block_path = self._block_search(blocks[b], cg.mask_to_ids(blocks[b]), bonus, best_len)
+                if block_path:
+                    full_path = self._expand(block_path, tails)
+                    if len(full_path) > best_len:
+                        best_len, best_path = len(full_path), full_path
+                        self._improve(best_path)
+
+        return best_path, best_len
+
+    def _improve(self, path):
+        self.best_path = path
+        if self.metrics is not None:
+            self.metrics.incumbent(len(path))
+        if self.progress is not None:
+            self.progress.incumbent(len(path), self.compact.to_names(path))
+
+    @staticmethod
+    def _expand(block_path, tails):
+        start, end = block_path[0], block_path[-1]
+        head = tails.get(start, [start])[::-1]
+        if start == end:
+            return head
+        return head + block_path[1:-1] + tails.get(end, [end])
+
+    # Melhor caminho dentro do bloco começando em um dos starts; o valor do
+    # caminho é len + bônus das duas pontas. Retorna [] se não superar floor.
+    def _block_search(self, block_mask, starts, bonus, floor):
+        cg = self.compact
+        adj = cg.adj
+        max_bonus = max(bonus.values(), default=0)
+        best_value = floor
+        best_path = []
+        path = []
+        reach = self.reach
+        reach.reset(cg.mask_to_ids(block_mask))
+        blocked = reach.blocked
+
+        frames = [_PathFrame() for _ in range(block_mask.bit_count())]
+
+        def dfs(node, start_bonus):
+            nonlocal best_value, best_path
+            depth = -1
+            while True:
+                if node is not None:
+                    self.search_count += 1
+                    if self.cancel_token is not None:
+                        self.cancel_token.check()
+                    path.append(node)
+                    value = len(path) + start_bonus + (bonus.get(node, 0) if len(path) > 1 else 0)
+                    if value > best_value:
+                        best_value = value
+                        best_path = list(path)
+                    reach.enter(node, best_value - len(path) - start_bonus - max_bonus)
+                    depth += 1
+                    frame = frames[depth]
+                    frame.node = node
+                    frame.index = 0
+                    node = None
+
+                frame = frames[depth]
+                row = adj[frame.node]
+                while frame.index < len(row):
+                    nbr = row[frame.index]
+                    frame.index += 1
+                    if blocked[nbr]:
+                        continue
+                    if len(path) + start_bonus + reach.extension(nbr) + max_bonus > best_value:
+                        node = nbr
+                        break
+                    self.bound_prunes += 1
+                if node is not None:
+                    continue
+
+                path.pop()
+                reach.leave()
+                depth -= 1
+                if depth < 0:
+                    return
+
+        for start in starts:
+            dfs(start, bonus.get(start, 0))
+        return best_path
+
+_worker_search = None
+
+def _init_longest_path_worker(compact, shared_best, table_size):
+    global _worker_search
+    if isinstance(compact, str):
+        # caminho de snapshot: o worker mapeia o arquivo em vez de receber o grafo
+        # serializado. Nada fica compartilhado depois disso: cada worker lê o
+        # arquivo e monta a sua própria cópia do CompactGraph (~0,1 s com 50 mil estações)
+        compact = GraphSnapshot.load(compact).to_compact()
+    _worker_search = LongestPathSearch(compact, shared_best, table_size)
+
+def _longest_path_worker(start):
+    search = _worker_search
+    search.best_path = []
+    search.search_count = 0
+    search.table_prunes = 0
+    search.bound_prunes = 0
+    table = search.table
+    hits, misses = (table.hits, table.misses) if table else (0, 0)
+    search.run_from(start)
+    if table:
+        hits, misses = table.hits - hits, table.misses - misses
+    prunes = {"reach_bound": search.bound_prunes, "transposition": search.table_prunes}
+    return start, search.best_path, search.search_count, hits, misses, prunes
+
+# Guloso do caminho mais longo: anda sempre para o vizinho livre com mais
+# vizinhos livres. A contagem de vizinhos livres de cada nó é mantida de forma
+# incremental num único vetor compartilhado por todos os nós iniciais
+# (desfeito ao fim de cada caminhada). Com both_ends, depois de travar na
+# ponta final o caminho também cresce a partir do nó inicial.
+class GreedyLongestPath:
+    def __init__(self, compact, both_ends=True):
+        self.compact = compact
+        self.both_ends = both_ends
+        self.free_count = list(compact.degree)
+        self.visited = bytearray(compact.node_count)
+        self.steps = 0
+
+    def run(self, start):
+        adj = self.compact.adj
+        free_count = self.free_count
+        self.visited[start] = 1
+        for w in adj[start]:
+            free_count[w] -= 1
+        forward = self._walk(start)
+        backward = self._walk(start) if self.both_ends else []
+        path = backward[::-1] + [start] + forward
+        for x in path:
+            self.visited[x] = 0
+            for w in adj[x]:
+                free_count[w] += 1
+        return path
+
+    def _walk(self, current):
+        adj = self.compact.adj
+        free_count = self.free_count
+        visited = self.visited
+        added = []
+        while True:
+            best_candidate = None
+            best_cover = -1
+            for u in adj[current]:
+                if free_count[u] > best_cover and not visited[u]:
+                    best_cover = free_count[u]
+                    best_candidate = u
+            if best_candidate is None:
+                self.steps += len(added)
+                return added
+            visited[best_candidate] = 1
+            for w in adj[best_candidate]:
+                free_count[w] -= 1
+            added.append(best_candidate)
+            current = best_candidate
+
+# Guloso do conjunto dominante com fila de baldes por ganho (vizinhos ainda
+# não dominados), escolhendo o vértice de maior ganho e, no empate, o de menor
+# id. Os baldes base (vértices pelo grau, em ordem de id) são compartilhados
+# por todos os nós iniciais e lidos com um cursor por balde; quem perde ganho
+# durante a execução vai para um heap pequeno do balde novo. Entradas velhas
+# são descartadas ao chegar no topo. Dominados e ganhos são desfeitos ao fim
+# de cada execução, como no guloso do caminho.
+class GreedyDominatingSet:
+    def __init__(self, compact):
+        self.compact = compact
+        self.gain = list(compact.degree)
+        self.dominated = bytearray(compact.node_count)
+        self.top_gain = max(compact.degree, default=0)
+        self.base_buckets = [[] for _ in range(self.top_gain + 1)]
+        for u, gain in enumerate(self.gain):
+            self.base_buckets[gain].append(u)
+        self.steps = 0
+
+    def run(self, start):
+        adj = self.compact.adj
+        gain = self.gain
+        dominated = self.dominated
+        base_buckets = self.base_buckets
+        heappush, heappop = heapq.heappush, heapq.heappop
+        cursor = [0] * (self.top_gain + 1)
+        moved = [[] for _ in range(self.top_gain + 1)]
+        newly_dominated = []
+        node_count = self.compact.node_count
+        chosen = []
+        level = self.top_gain
+        u = start
+        while True:
+            chosen.append(u)
+            for x in (u, *adj[u]):
+                if dominated[x]:
+                    continue
+                dominated[x] = 1
+                newly_dominated.append(x)
+                for w in adj[x]:
+                    g = gain[w] - 1
+                    gain[w] = g
+                    if not dominated[w]:
+                        heappush(moved[g], w)
+            if len(newly_dominated) == node_count:
+                break
+            # pick vertex that covers most undominated
+            while True:
+                base = base_buckets[level]
+                i = cursor[level]
+                while i < len(base) and (dominated[base[i]] or gain[base[i]] != level):
+                    i += 1
+                cursor[level] = i
+                heap = moved[level]
+                while heap and (dominated[heap[0]] or gain[heap[0]] != level):
+                    heappop(heap)
+                if i < len(base):
+                    u = base[i] if not heap or base[i] < heap[0] else heap[0]
+                    break
+                if heap:
+                    u = heap[0]
+                    break
+                level -= 1
+            self.steps += 1
+        for x in newly_dominated:
+            dominated[x] = 0
+            for w in adj[x]:
+                gain[w] += 1
+        return chosen
+
+# Kernel do conjunto dominante: o problema vira uma cobertura de conjuntos
+# (elementos = vértices ainda a dominar, candidatos = vértices que podem
+# entrar no conjunto) reduzida por regras seguras até um ponto fixo:
+#   - elemento com um único candidato força esse candidato (vizinho de folha);
+#   - candidato cuja cobertura está contida na de outro sai (gêmeos: fica um);
+#   - elemento cujos candidatos contêm os de outro sai (é dominado junto).
+# As regras rodam sobre as vizinhanças fechadas (listas) com filas de
+# trabalho: uma regra só é reavaliada onde algo mudou (cobertura de um
+# candidato ou candidatos de um elemento). As máscaras saem só no fim.
+# Cada regra aplicada é segura sozinha, então se o prazo acaba no meio a
+# redução para onde está (complete = False) e o kernel parcial vale.
+class DominatingSetKernel:
+    def __init__(self, compact, cancel_token=None):
+        self.compact = compact
+        self.cancel_token = cancel_token
+        n = compact.node_count
+        self.closed = [[v] + row for v, row in enumerate(compact.adj)]
+        self.is_element = bytearray(b"\x01") * n
+        self.is_candidate = bytearray(b"\x01") * n
+        self.forced_ids = []
+        self.complete = True
+        try:
+            self.reduce()
+        except DeadlineExceeded:
+            self.complete = False
+        self.forced = compact.ids_to_mask(self.forced_ids)
+        self.elements = compact.ids_to_mask(v for v in range(n) if self.is_element[v])
+        self.candidate_ids = [v for v in range(n) if self.is_candidate[v]]
+        self.candidates = compact.ids_to_mask(self.candidate_ids)
+
+    def cover(self, u):
+        return self.compact.closed_mask[u] & self.elements
+
+    def candidates_of(self, x):
+        # u cobre x se e somente se u está em N[x]
+        return self.compact.closed_mask[x] & self.candidates
+
+    # filas na ordem das passadas: forçar, tirar candidatos, tirar elementos
+    def reduce(self):
+        n = self.compact.node_count
+        self._queues = [deque(range(n)) for _ in range(3)]
+        self._queued = [bytearray(b"\x01") * n for _ in range(3)]
+        rules = (self._force_unique_candidate, self._drop_dominated_candidate, self._drop_dominated_elements)
+        steps = 0
+        while any(self._queues):
+            for queue_, queued, rule in zip(self._queues, self._queued, rules):
+                while queue_:
+                    v = queue_.popleft()
+                    queued[v] = 0
+                    rule(v)
+                    steps += 1
+                    if self.cancel_token is not None and steps % CancellationToken.CHECK_INTERVAL == 0:
+                        self.cancel_token.check()
+
+    def _push(self, rule, ids):
+        queue_, queued = self._queues[rule], self._queued[rule]
+        for v in ids:
+            if not queued[v]:
+                queued[v] = 1
+                queue_.append(v)
+
+    # elementos que saíram mudam a cobertura dos candidatos em volta
+    def _remove_element(self, x):
+        self.is_element[x] = 0
+        is_candidate = self.is_candidate
+        self._push(1, [c for c in self.closed[x] if is_candidate[c]])
+
+    # candidato que saiu muda os candidatos dos elementos em volta
+    def _remove_candidate(self, u):
+        self.is_candidate[u] = 0
+        is_element = self.is_element
+        touched = [x for x in self.closed[u] if is_element[x]]
+        self._push(0, touched)
+        self._push(2, touched)
+
+    def _force_unique_candidate(self, x):
+        if not self.is_element[x]:
+            return
+        is_candidate = self.is_candidate
+        cands = [u for u in self.closed[x] if is_candidate[u]]
+        if len(cands) == 1:
+            u = cands[0]
+            self.forced_ids.append(u)
+            self.is_candidate[u] = 0
+            for y in self.closed[u]:
+                if self.is_element[y]:
+                    self._remove_element(y)
+
+    def _drop_dominated_candidate(self, u):
+        if not self.is_candidate[u]:
+            return
+        closed, is_element, is_candidate = self.closed, self.is_element, self.is_candidate
+        cover_u = [x for x in closed[u] if is_element[x]]
+        if cover_u:
+            # quem contém a cobertura de u cobre, em particular, o menor elemento dela
+            for w in closed[min(cover_u)]:
+                if w == u or not is_candidate[w]:
+                    continue
+                row = closed[w]
+                if all(x in row for x in cover_u):
+                    same = sum(1 for x in row if is_element[x]) == len(cover_u)
+                    if not same or u > w:
+                        break
+            else:
+                return
+        self._remove_candidate(u)
+
+    def _drop_dominated_elements(self, y):
+        if not self.is_element[y]:
+            return
+        closed, is_element, is_candidate = self.closed, self.is_element, self.is_candidate
+        cands_y = [c for c in closed[y] if is_candidate[c]]
+        if not cands_y:
+            return
+        for x in closed[min(cands_y)]:
+            if x == y or not is_element[x]:
+                continue
+            row = closed[x]
+            if all(c in row for c in cands_y):
+                same = sum(1 for c in row if is_candidate[c]) == len(cands_y)
+                if not same or x > y:
+                    self._remove_element(x)
+
+    def stats(self):
+        return {
+            "forced": self.forced.bit_count(),
+            "candidates": self.candidates.bit_count(),
+            "elements": self.elements.bit_count(),
+        }
+
+# Limites inferiores plugáveis para o branch and bound do conjunto dominante.
+# Cada limite estima quantos vértices ainda faltam para dominar free usando só
+# os candidatos em allowed; o primeiro que atinge a folga poda o nó e a poda
+# é contabilizada no nome dele.
+class DominationBounds:
+    AVAILABLE = ("max_cover", "coverage", "packing", "lp")
+    DEFAULT = ("max_cover", "packing", "lp")
+
+    def __init__(self, kernel, names=None):
+        names = tuple(names) if names else self.DEFAULT
+        unknown = [name for name in names if name not in self.AVAILABLE]
+        if unknown:
+            raise ValueError(f"Limite desconhecido: {', '.join(unknown)}")
+        self.compact = kernel.compact
+        self.cover_mask = [kernel.cover(v) for v in range(kernel.compact.node_count)]
+        self.candidate_ids = kernel.candidate_ids
+        self.max_cover = max((self.cover_mask[v].bit_count() for v in self.candidate_ids), default=1)
+        self.active = [(name, getattr(self, f"_{name}_bound")) for name in names]
+        self.pruned = {name: 0 for name in names}
+
+    def lower_bound(self, free, allowed):
+        return max((bound(free, allowed) for _, bound in self.active), default=0)
+
+    def prunes(self, free, allowed, slack):
+        for name, bound in self.active:
+            if bound(free, allowed) >= slack:
+                self.pruned[name] += 1
+                return True
+        return False
+
+    # ceil(não dominados / maior cobertura possível de um vértice)
+    def _max_cover_bound(self, free, allowed):
+        return (free.bit_count() + self.max_cover - 1) // self.max_cover
+
+    # menor k tal que os k maiores ganhos reais cobrem o que falta
+    def _coverage_bound(self, free, allowed):
+        gains = sorted(((self.cover_mask[u] & free).bit_count() for u in self.candidate_ids
+                        if (allowed >> u) & 1), reverse=True)
+        remaining = free.bit_count()
+        for k, gain in enumerate(gains):
+            if gain == 0:
+                break
+            remaining -= gain
+            if remaining <= 0:
+                return k + 1
+        return math.inf
+
+    # 2-packing guloso: elementos sem candidato em comum exigem vértices distintos
+    def _packing_bound(self, free, allowed):
+        closed_mask = self.compact.closed_mask
+        used = 0
+        count = 0
+        while free:
+            low = free & -free
+            cands = closed_mask[low.bit_length() - 1] & allowed
+            if not cands:
+                return math.inf
+            if not cands & used:
+                used |= cands
+                count += 1
+            free ^= low
+        return count
+
+    # Relaxação linear pelo dual: y_e = 1 / (maior ganho entre os candidatos de e)
+    # é viável no dual, então ceil(sum y_e) limita o ótimo por dualidade fraca.
+    def _lp_bound(self, free, allowed):
+        closed_mask = self.compact.closed_mask
+        cover_mask = self.cover_mask
+        gain = {}
+        total = 0.0
+        rest = free
+        while rest:
+            low = rest & -rest
+            cands = closed_mask[low.bit_length() - 1] & allowed
+            if not cands:
+                return math.inf
+            best = 0
+            while cands:
+                c = cands & -cands
+                u = c.bit_length() - 1
+                g = gain.get(u)
+                if g is None:
+                    g = gain[u] = (cover_mask[u] & free).bit_count()
+                if g > best:
+                    best = g
+                cands ^= c
+            total += 1.0 / best
+            rest ^= low
+        return math.ceil(total - 1e-9)
+
+# Teste de cobertura em lote para a força bruta, com NumPy (opcional, só
+# importado aqui). Os vértices a dominar são renumerados 0..E-1 e a cobertura
+# de cada candidato vira uma linha de palavras uint64; um bloco de combinações
+# é avaliado com um OR por linha e uma comparação com o alvo.
+class CoverageBatch:
+    def __init__(self, np, cover_masks, elements, batch_size=4096):
+        self.np = np
+        self.batch_size = batch_size
+        positions = {}
+        rest = elements
+        while rest:
+            low = rest & -rest
+            positions[low.bit_length() - 1] = len(positions)
+            rest ^= low
+        self.word_count = max(1, -(-len(positions) // 64))
+        # cada linha percorre só os bits da própria cobertura
+        rows = []
+        for mask in cover_masks:
+            packed = 0
+            rest = mask & elements
+            while rest:
+                low = rest & -rest
+                packed |= 1 << positions[low.bit_length() - 1]
+                rest ^= low
+            rows.append(self._words(packed))
+        self.rows = np.frombuffer(b"".join(rows), dtype="<u8").astype(np.uint64).reshape(-1, self.word_count)
+        self.target = np.frombuffer(self._words((1 << len(positions)) - 1), dtype="<u8").astype(np.uint64)
+
+    @classmethod
+    def create(cls, cover_masks, elements, batch_size=4096):
+        try:
+            import numpy
+        except ImportError:
+            return None
+        return cls(numpy, cover_masks, elements, batch_size)
+
+    def _words(self, mask):
+        return mask.to_bytes(8 * self.word_count, "little")
+
+    # blocos (linhas x r) de índices das linhas, lidos do iterador de tuplas
+    def blocks(self, tails, r):
+        if r == 0:
+            if next(tails, None) is not None:
+                yield self.np.empty((1, 0), dtype=self.np.intp)
+            return
+        while True:
+            flat = self.np.fromiter(itertools.chain.from_iterable(itertools.islice(tails, self.batch_size)),
+                                    dtype=self.np.intp)
+            if not flat.size:
+                return
+            yield flat.reshape(-1, r)
+
+    def prefix_cover(self, prefix):
+        return self.np.bitwise_or.reduce(self.rows[list(prefix)], axis=0) if prefix else 0
+
+    # posição da primeira combinação do bloco que, junto do prefixo, cobre tudo, ou None
+    def first_cover(self, block, base=0):
+        covered = self.np.bitwise_or.reduce(self.rows[block], axis=1) | base
+        hits = self.np.flatnonzero((covered == self.target).all(axis=1))
+        return int(hits[0]) if hits.size else None
+
+# Varredura dos subconjuntos de tamanho k dos candidatos (posições 0..n-1),
+# na ordem de itertools.combinations, restrita a uma faixa [start, stop) de
+# postos. O posto inicial é desfeito direto na combinação (unranking), então
+# cada processo começa no meio da sequência sem percorrer o que vem antes.
+# tested acumula as combinações testadas entre chamadas.
+class SubsetCoverScan:
+    def __init__(self, cover_masks, elements, batch_size=4096):
+        self.cover_masks = cover_masks
+        self.cover_size = [mask.bit_count() for mask in cover_masks]
+        self.elements = elements
+        self.element_count = elements.bit_count()
+        self.batch = CoverageBatch.create(cover_masks, elements, batch_size) if batch_size else None
+        self.tested = 0
+        self.coverage_prunes = 0
+
+    @staticmethod
+    def unrank(n, k, rank):
+        combo = []
+        x = 0
+        # combinações que ainda começam com x na posição i: comb(n - x - 1, k - i - 1),
+        # tirado do anterior pela razão entre binomiais vizinhos
+        count = math.comb(n - 1, k - 1) if k else 0
+        for i in range(k):
+            top, r = n - x - 1, k - i - 1
+            while rank >= count:
+                rank -= count
+                x += 1
+                count = count * (top - r) // top
+                top -= 1
+            combo.append(x)
+            x += 1
+            if r:
+                count = count * r // top
+        return tuple(combo)
+
+    # A faixa em pedaços (prefixo, sufixos, tamanho do sufixo): a partir da
+    # combinação inicial t, varia a posição j com t[:j] fixo, da última posição
+    # para a primeira; os sufixos vêm de itertools.combinations.
+    @classmethod
+    def chunks(cls, n, k, start, stop):
+        remaining = stop - start
+        if remaining <= 0:
+            return
+        first = cls.unrank(n, k, start)
+        if k == 0:
+            yield (), iter([()]), 0
+            return
+        for j in range(k - 1, -1, -1):
+            r = k - j - 1
+            low = first[j] if r == 0 else first[j] + 1
+            count = math.comb(n - low - 1, r)
+            for v in range(low, n - r):
+                tails = itertools.combinations(range(v + 1, n), r)
+                if count > remaining:
+                    tails = itertools.islice(tails, remaining)
+                yield first[:j] + (v,), tails, r
+                remaining -= count
+                if remaining <= 0:
+                    return
+                if r:
+                    count = count * (n - v - 1 - r) // (n - v - 1)
+
+    # primeira combinação da faixa que domina, ou None; check(testadas) é
+    # chamado periodicamente e, se devolver verdadeiro, interrompe a varredura
+    def scan(self, k, start, stop, check=None):
+        batch = self.batch
+        # testadas desde a última chamada de check: check só vê combinações
+        # concluídas, então start + total passado a check é sempre um posto válido
+        pending = 0
+        for prefix, tails, r in self.chunks(len(self.cover_masks), k, start, stop):
+            if batch is not None and k > 0:
+                base = batch.prefix_cover(prefix)
+                for block in batch.blocks(tails, r):
+                    hit = batch.first_cover(block, base)
+                    if hit is not None:
+                        self.tested += hit + 1
+                        return prefix + tuple(int(i) for i in block[hit])
+                    self.tested += len(block)
+                    if check is not None and check(len(block)):
+                        return None
+                continue
+            for tail in tails:
+                candidate = prefix + tail
+                if self._covers(candidate):
+                    self.tested += 1
+                    return candidate
+                self.tested += 1
+                pending += 1
+                if check is not None and pending == CancellationToken.CHECK_INTERVAL:
+                    pending = 0
+                    if check(CancellationToken.CHECK_INTERVAL):
+                        return None
+        return None
+
+    def _covers(self, candidate):
+        size = len(candidate)
+        covered_mask = 0
+        for idx in range(size + 1):
+            if covered_mask == self.elements:
+                return True
+            if idx == size:
+                return False
+            covered_mask |= self.cover_masks[candidate[idx]]
+            remaining_vertices = candidate[idx + 1:]
+            if remaining_vertices:
+                max_coverage = max(self.cover_size[w] for w in remaining_vertices)
+                if covered_mask.bit_count() + (size - idx - 1) * max_coverage < self.element_count:
+                    self.coverage_prunes += 1
+                    return False
+
+_worker_scan = None
+_worker_stop = None
+
+def _init_dominating_worker(cover_masks, elements, batch_size, stop_event):
+    global _worker_scan, _worker_stop
+    _worker_scan = SubsetCoverScan(cover_masks, elements, batch_size)
+    _worker_stop = stop_event
+
+# uma faixa de postos; para cedo quando outro worker já achou um conjunto
+def _dominating_range_worker(task):
+    k, start, stop = task
+    scan = _worker_scan
+    tested, prunes = scan.tested, scan.coverage_prunes
+    combo = None
+    if not _worker_stop.is_set():
+        combo = scan.scan(k, start, stop, lambda count: _worker_stop.is_set())
+        if combo is not None:
+            _worker_stop.set()
+    return start, combo, scan.tested - tested, scan.coverage_prunes - prunes
+
+# Canal de progresso de um motor do portfólio, dentro do processo filho: cada
+# melhoria vai para o incumbente compartilhado (que os outros motores usam
+# para podar) e para a fila lida pelo processo pai, junto com a solução.
+class _PortfolioChannel:
+    def __init__(self, engine, shared_best, events, maximize):
+        self.engine = engine
+        self.shared_best = shared_best
+        self.events = events
+        self.maximize = maximize
+
+    def progress(self, percent):
+        pass
+
+    def incumbent(self, value, solution):
+        with self.shared_best.get_lock():
+            if (value > self.shared_best.value) if self.maximize else (value < self.shared_best.value):
+                self.shared_best.value = value
+        self.events.put(("incumbent", self.engine, value, list(solution)))
+
+def _portfolio_worker(source, engine, method_name, kwargs, shared_best, stop_event, events, time_budget, maximize):
+    if isinstance(source, str):
+        solver = MetroSolver.from_snapshot(GraphSnapshot.load(source))
+    else:
+        solver = MetroSolver(None, source)
+    channel = _PortfolioChannel(engine, shared_best, events, maximize)
+    report = {}
+    try:
+        # vários motores imprimindo ao mesmo tempo só embaralhariam o terminal
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            getattr(solver, method_name)(output_file=os.devnull, cancel_token=CancellationToken(stop_event),
+                                         progress=channel, time_budget=time_budget, report=report, **kwargs)
+        events.put(("done", engine, report))
+    except SolverCancelled:
+        events.put(("cancelled", engine, None))
+    except Exception as e:
+        events.put(("failed", engine, str(e)))
+
+class MetroSolver:
+    # motores do modo portfólio por problema: algoritmo -> método
+    PORTFOLIO_ENGINES = {
+        "A": {
+            "branch_and_bound": "branchBound_solve_longest_path",
+            "bloco_corte": "blockCut_solve_longest_path",
+            "heuristica": "greedy_solve_longest_path",
+        },
+        "B": {
+            "branch_and_bound": "branchBound_solve_dominating_set",
+            "heuristica": "greedy_solve_dominating_set",
+        },
+    }
+    PORTFOLIO_GRACE = 2.0
+
+    def __init__(self, graph, compact=None, snapshot_path=None):
+        self.graph = graph
+        self.compact = compact if compact is not None else CompactGraph.from_networkx(graph)
+        self.node_count = self.compact.node_count
+        self.snapshot_path = snapshot_path
+        self._compact_by_name = None
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        return cls(None, snapshot.to_compact(), snapshot.path)
+
+    # Grafo com ids reindexados em ordem alfabética (o id do vértice é a sua
+    # posição), usado pelos solvers do conjunto dominante. Montado uma única
+    # vez, na primeira chamada; se os nomes já estão em ordem é o próprio compact.
+    @property
+    def compact_by_name(self):
+        if self._compact_by_name is None:
+            order = self.compact.by_name()
+            if all(old == k for k, old in enumerate(order)):
+                self._compact_by_name = self.compact
+            else:
+                self._compact_by_name = self.compact.permuted(order)
+        return self._compact_by_name
+        
+    def execute_menu(self):
+        print("\n Trabalho PAA: Vinicius Goddard e Victor Hugo \n")
+        problem_choice = self._get_problem_selection()
+        print(f"Problema {problem_choice} selecionado.\n")
+        
+        algorithm_map = {
+            '1': self._run_brute_force,
+            '2': self._run_branch_bound,
+            '3': self._run_approximation,
+            '4': self._run_block_cut,
+            '0': lambda x: print("Encerrando.")
+        }
+        
+        while True:
+            self._display_algorithm_menu()
+            choice = input("Digite sua escolha: ")
+            
+            if choice == '0':
+                algorithm_map[choice](problem_choice)
+                break
+            elif choice in algorithm_map:
+                algorithm_map[choice](problem_choice)
+            else:
+                print("Opção inválida. Tente novamente.")
+    
+    def _get_problem_selection(self):
+        selection = None
+        while selection not in ['1', '2']:
+            print("Metrô de Paris\n")
+            selection = input("Deseja Resolver Problema 1) ou Problema 2)? (1/2)\n").strip()
+            if selection not in ['1', '2']:
+                print("Escolha invalida.\n")
+        return selection
+    
+    def _display_algorithm_menu(self):
+        options = ["1) Força Bruta", "2) Branch and Bound", "3) Aproximação", "4) Decomposição em Blocos", "0) Sair"]
+        print("Algoritmo:\n")
+        for option in options:
+            print(f"{option}\n")
+    
+    def _run_brute_force(self, problem_type):
+        if problem_type == '1':
+            self.bruteForce_solve_longest_path()
+        else:
+            self.bruteForce_solve_dominating_set()
+    
+    def _run_branch_bound(self, problem_type):
+        if problem_type == '1':
+            self.branchBound_solve_longest_path()
+        else:
+            self.branchBound_solve_dominating_set()
+    
+    def _run_approximation(self, problem_type):
+        if problem_type == '1':
+            self.greedy_solve_longest_path()
+        else:
+            self.greedy_solve_dominating_set()
+    
+    def _run_block_cut(self, problem_type):
+        if problem_type == '1':
+            self.blockCut_solve_longest_path()
+        else:
+            print("Decomposição em blocos disponível apenas para o Problema 1.")
+    
+    # algorithmo de força bruta com backtracking
+    # Adicionei logs detalhados para verificar se os nós estão sendo explorados e se o algoritmo está entrando nos loops esperados.
+    def bruteForce_solve_longest_path(self, output_file="maior_caminhoBrute.txt", cancel_token=None, progress=None,
+                                      time_budget=None, report=None, checkpoint=None, checkpoint_interval=60.0,
+                                      resume=False):
+        cg = self.compact
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        timed_out = False
+        adj = cg.adj
+        N = cg.node_count
+        sorted_nodes = cg.by_degree_desc()
+        optimal_path = []
+        search_count = 0
+        bound_prunes = 0
+        with open(output_file, "w"):
+            pass
+
+        N_start = len(sorted_nodes)
+        start_count = 0
+        threshold = 5
+
+        frames = [_PathFrame() for _ in range(N)]
+        reach = ResidualComponents(cg)
+        blocked = reach.blocked
+        ckpt = state = None
+        checkpoint_due = False
+        if checkpoint:
+            ckpt = SearchCheckpoint(checkpoint, "bruteForce_longest_path", cg, interval=checkpoint_interval)
+            state = ckpt.load() if resume else None
+
+        def save(start_index, current_path, depth):
+            frontier = None
+            if current_path is not None:
+                frontier = {"path": list(current_path), "frames": [frames[i].index for i in range(depth + 1)]}
+            ckpt.save({"start_index": start_index, "frontier": frontier, "best_path": optimal_path,
+                       "search_count": search_count, "bound_prunes": bound_prunes})
+
+        def explore_path(current_node, current_path, depth=-1):
+            nonlocal optimal_path, search_count, bound_prunes, checkpoint_due
+            while True:
+                if current_node is not None:
+                    current_path.append(current_node)
+                    reach.enter(current_node, len(optimal_path) - len(current_path))
+                    #pruning: só conta o que ainda é alcançável a partir do nó atual
+                    if len(current_path) + reach.reach() <= len(optimal_path):
+                        bound_prunes += 1
+                        reach.leave()
+                        current_path.pop()
+                        if depth < 0:
+                            return
+                    else:
+                        depth += 1
+                        frame = frames[depth]
+                        frame.node = current_node
+                        frame.index = 0
+                    current_node = None
+
+                if checkpoint_due:
+                    checkpoint_due = False
+                    save(start_index, current_path, depth)
+                frame = frames[depth]
+                row = adj[frame.node]
+                while current_node is None and frame.index < len(row):
+                    neighbor = row[frame.index]
+                    frame.index += 1
+                    if not blocked[neighbor]:
+                        current_node = neighbor
+                if current_node is not None:
+                    continue
+
+                if len(current_path) > len(optimal_path):
+                    optimal_path = current_path.copy()
+                    self._report_incumbent(progress, len(optimal_path), cg.to_names(optimal_path), metrics)
+                    if len(optimal_path) == N:
+                        raise StopIteration
+
+                search_count += 1
+                if cancel_token is not None:
+                    cancel_token.check()
+                if search_count % CancellationToken.CHECK_INTERVAL == 0:
+                    checkpoint_due = ckpt is not None and ckpt.due()
+                reach.leave()
+                current_path.pop()
+                depth -= 1
+                if depth < 0:
+                    return
+
+        first_index = 0
+        if state is not None:
+            first_index = state["start_index"]
+            optimal_path, search_count, bound_prunes = state["best_path"], state["search_count"], state["bound_prunes"]
+            start_count = first_index
+        metrics.phase("search")
+        try:
+            for start_index in range(first_index, N_start):
+                if start_index == first_index and state is not None and state["frontier"] is not None:
+                    # retoma a pilha salva: o caminho e os frames do nó inicial em andamento
+                    current_path = state["frontier"]["path"]
+                    for depth, (node, index) in enumerate(zip(current_path, state["frontier"]["frames"])):
+                        reach.enter(node)
+                        frames[depth].node, frames[depth].index = node, index
+                    explore_path(None, current_path, len(current_path) - 1)
+                else:
+                    explore_path(sorted_nodes[start_index], [])
+                start_count += 1
+                percent = (start_count / N_start) * 100
+                if percent >= threshold:
+                    print(f"{threshold}% completo")
+                    self.update_progress(threshold, progress)
+                    threshold += 5
+                if ckpt is not None and ckpt.due():
+                    save(start_index + 1, None, -1)
+        except StopIteration:
+            pass
+        except DeadlineExceeded:
+            timed_out = True
+        if ckpt is not None and not timed_out:
+            ckpt.clear()
+
+        metrics.phase("bound")
+        metrics.prune("reach_bound", bound_prunes)
+        bound = cg.longest_path_upper_bound() if timed_out else len(optimal_path)
+        self._finish_report(report, len(optimal_path), bound, timed_out, search_count=search_count, metrics=metrics)
+
+        optimal_path = cg.to_names(optimal_path)
+        self._write_path_result(optimal_path, output_file)
+        print(f"Nos iniciais testados: {start_count}/{N_start} ({round((start_count/N_start)*100)}%)")
+        print(f"Total de chamadas recursivas: {search_count}")
+        return optimal_path, search_count
+
+    # Sem min_size/max_size a faixa de tamanhos é automática: aprofunda k a
+    # partir do limite inferior do kernel e para antes do tamanho do guloso;
+    # se nenhum tamanho menor domina, o conjunto guloso é o mínimo.
+    def bruteForce_solve_dominating_set(self, min_size=None, max_size=None, output_file="dominantBrute.txt",
+                                        cancel_token=None, progress=None, time_budget=None, report=None,
+                                        batch_size=4096, workers=1, checkpoint=None, checkpoint_interval=60.0,
+                                        resume=False):
+        cg = self.compact
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        metrics.phase("kernel")
+        kernel = DominatingSetKernel(cg, cancel_token)
+        # tamanhos abaixo deste limite não têm solução
+        lower_bound = len(cg.mask_to_ids(kernel.forced)) + DominationBounds(
+            kernel, ("packing", "lp")).lower_bound(kernel.elements, kernel.candidates)
+        elements = kernel.elements
+        forced = cg.mask_to_ids(kernel.forced)
+        node_list = [v for v in cg.by_degree_desc() if kernel.is_candidate[v]]
+        element_count = elements.bit_count()
+        with open(output_file, "w"):
+            pass
+        print(f"Kernel: {len(forced)} forcados, {len(node_list)} candidatos, {element_count} vertices a dominar")
+
+        greedy_mask = None
+        if min_size is None:
+            min_size = lower_bound
+        if max_size is None:
+            metrics.phase("greedy")
+            greedy_mask = self._warm_start_dominating(cg, True, cancel_token=cancel_token)
+            max_size = greedy_mask.bit_count() - 1
+            print(f"Faixa automatica: {min_size} a {max_size + 1} (limite inferior e guloso)")
+
+        # soma dos binomiais com cada termo tirado do anterior (um math.comb só)
+        def combinations_in(first, last):
+            n, k = len(node_list), max(first, len(forced)) - len(forced)
+            term = math.comb(n, k)
+            total = 0
+            for _ in range(max(first, len(forced)), last + 1):
+                if not term:
+                    break
+                total += term
+                term = term * (n - k) // (k + 1)
+                k += 1
+            return total
+
+        max_k = min(max_size, self.node_count)
+        total_combinations = combinations_in(min_size, max_k)
+
+        # sem NumPy (ou com batch_size=0) cada combinação é testada em Python
+        scan = SubsetCoverScan([kernel.cover(v) for v in node_list], elements, batch_size)
+        if batch_size and scan.batch is None:
+            print("NumPy indisponivel: teste de cobertura combinacao a combinacao")
+        if workers is None:
+            workers = os.cpu_count() or 1
+        ckpt = state = None
+        if checkpoint:
+            ckpt = SearchCheckpoint(checkpoint, "bruteForce_dominating_set", cg,
+                                    {"min_size": min_size, "max_size": max_k}, checkpoint_interval)
+            state = ckpt.load() if resume else None
+
+        metrics.phase("search")
+        dominating_set, tested_count, timed_out, exhausted = self._enumerate_dominating_sets(
+            cg, kernel, node_list, scan, min_size, max_k, total_combinations, output_file, cancel_token, progress,
+            metrics, workers, batch_size, ckpt, state)
+        if ckpt is not None and not timed_out:
+            ckpt.clear()
+        # todo tamanho esgotado sem solução sobe o limite inferior
+        if min_size <= lower_bound:
+            lower_bound = max(lower_bound, exhausted + 1)
+        if dominating_set is None and greedy_mask is not None:
+            dominating_set = cg.mask_to_names(greedy_mask)
+            if not timed_out:
+                self._write_dominating_result(dominating_set, len(dominating_set), output_file)
+                # só é mínimo se a varredura começou no limite inferior (min_size explícito acima dele
+                # deixa tamanhos menores sem testar)
+                if len(dominating_set) <= lower_bound:
+                    print(f"Nenhum tamanho menor domina: o guloso com {len(dominating_set)} e minimo.")
+                else:
+                    print(f"Tamanhos abaixo de {min_size} nao foram testados: fica o guloso com "
+                          f"{len(dominating_set)}, sem prova de que e minimo.")
+        # combinações que uma varredura de len(forced) até o guloso faria e esta não testou
+        upper_size = max_k + 1 if greedy_mask is not None else max_k
+        skipped = combinations_in(len(forced), upper_size) - tested_count
+        if dominating_set is None:
+            self._finish_report(report, None, lower_bound, timed_out, proven=False, search_count=tested_count,
+                                metrics=metrics)
+            if not timed_out:
+                print("Nenhum conjunto dominante identificado nos tamanhos testados.")
+        else:
+            size = len(dominating_set)
+            self._finish_report(report, size, lower_bound, timed_out, proven=size <= lower_bound,
+                                search_count=tested_count, metrics=metrics)
+        print(f"Combinacoes testadas: {tested_count}, puladas: {skipped}")
+        if report is not None:
+            report.update(size_range=[min_size, upper_size], skipped_combinations=skipped)
+        return dominating_set
+
+    # Com workers > 1 cada tamanho é dividido em faixas de postos distribuídas
+    # num Pool; o primeiro worker que acha um conjunto dominante para os demais
+    # (o conjunto pode diferir do serial, o tamanho não). O checkpoint guarda
+    # o tamanho atual e o posto até onde tudo já foi testado.
+    DOMINATING_RANGE = 1 << 16
+
+    def _enumerate_dominating_sets(self, cg, kernel, node_list, scan, min_size, max_k, total_combinations,
+                                   output_file, cancel_token, progress, metrics, workers=1, batch_size=4096,
+                                   ckpt=None, state=None):
+        forced = cg.mask_to_ids(kernel.forced)
+        tested_count = 0
+        coverage_prunes = 0
+        threshold = 5
+        first_size, first_rank = min_size, 0
+        if state is not None:
+            first_size, first_rank = state["size"], state["rank"]
+            tested_count, coverage_prunes = state["tested_count"], state["coverage_prunes"]
+        # maior tamanho enumerado por inteiro sem achar conjunto dominante
+        exhausted = first_size - 1
+        pool = None
+        stop_event = None
+
+        def found(candidate_set, size):
+            dominating_set = cg.to_names(forced + [node_list[i] for i in candidate_set])
+            self._write_dominating_result(dominating_set, size, output_file)
+            self._report_incumbent(progress, size, dominating_set, metrics)
+            print(f"Set dominante encontrado {size} apos testar {tested_count} combinacoes.")
+            return dominating_set, tested_count, False, exhausted
+
+        # progresso pelos totais combinados (serial ou somado entre workers);
+        # rank é o posto até onde o tamanho atual já foi todo testado e
+        # beyond, o que foi testado depois dele (fica fora do checkpoint)
+        def advance(count, size=None, rank=None, beyond=0):
+            nonlocal tested_count, threshold
+            tested_count += count
+            while (tested_count / total_combinations) * 100 >= threshold:
+                print(f"{threshold:.0f}%")
+                self.update_progress(threshold, progress)
+                threshold += 5
+            if ckpt is not None and rank is not None and ckpt.due():
+                ckpt.save({"size": size, "rank": rank, "tested_count": tested_count - beyond,
+                           "coverage_prunes": coverage_prunes + scan.coverage_prunes})
+            if cancel_token is not None:
+                cancel_token.check()
+
+        try:
+            for size in range(first_size, max_k + 1):
+                free_size = size - len(forced)
+                if free_size < 0:
+                    continue
+                print(f"\nVerificando subconjuntos de tamanho {size}")
+                size_total = math.comb(len(node_list), free_size)
+                start_rank = first_rank if size == first_size else 0
+                if workers <= 1 or size_total - start_rank <= 2 * self.DOMINATING_RANGE:
+                    before = scan.tested
+                    reported = 0
+
+                    def check(count):
+                        nonlocal reported
+                        reported += count
+                        advance(count, size, start_rank + reported)
+
+                    try:
+                        combo = scan.scan(free_size, start_rank, size_total, check)
+                    finally:
+                        tested_count += scan.tested - before - reported
+                        coverage_prunes, scan.coverage_prunes = coverage_prunes + scan.coverage_prunes, 0
+                    if combo is not None:
+                        return found(combo, size)
+                    exhausted = size
+                    continue
+
+                if pool is None:
+                    stop_event = multiprocessing.Event()
+                    pool = multiprocessing.Pool(workers, initializer=_init_dominating_worker,
+                                                initargs=(scan.cover_masks, kernel.elements, batch_size, stop_event))
+                # faixas curtas: o progresso anda e o cancelamento responde rápido
+                step = self.DOMINATING_RANGE
+                tasks = ((free_size, start, min(start + step, size_total))
+                         for start in range(start_rank, size_total, step))
+                results = pool.imap_unordered(_dominating_range_worker, tasks)
+                combo = None
+                # faixas concluídas fora de ordem, além do posto contíguo watermark
+                watermark, completed = start_rank, {}
+                while True:
+                    try:
+                        if cancel_token is not None:
+                            cancel_token.check()
+                        start, range_combo, tested, prunes = results.next(timeout=0.2)
+                    except multiprocessing.TimeoutError:
+                        continue
+                    except StopIteration:
+                        break
+                    coverage_prunes += prunes
+                    completed[start] = tested
+                    while watermark in completed:
+                        completed.pop(watermark)
+                        watermark = min(watermark + step, size_total)
+                    advance(tested, size, watermark, sum(completed.values()))
+                    if range_combo is not None:
+                        combo = range_combo
+                        break
+                if combo is not None:
+                    return found(combo, size)
+                exhausted = size
+        except DeadlineExceeded:
+            return None, tested_count, True, exhausted
+        finally:
+            if pool is not None:
+                # terminate interrompe as faixas que ainda estavam rodando
+                pool.terminate()
+                pool.join()
+            metrics.prune("coverage_bound", coverage_prunes)
+        return None, tested_count, False, exhausted
+
+    def _write_dominating_result(self, dominating_set, size, filename):
+        with open(filename, "a", encoding="utf-8") as file:
+            file.write(f"Conjunto dominante com {size} vértices:\n{list(dominating_set)}\n")
+    
+    def branchBound_solve_longest_path(self, output_file="maior_caminhoBranch.txt", workers=1, table_size=0,
+                                       cancel_token=None, progress=None, time_budget=None, report=None,
+                                       warm_start=None, shared_best=None, checkpoint=None, checkpoint_interval=60.0,
+                                       resume=False):
+        cg = self.compact
+        N = cg.node_count
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        timed_out = False
+
+        with open(output_file, "w", encoding="utf-8"):
+            pass
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+        ckpt = state = None
+        if checkpoint:
+            ckpt = SearchCheckpoint(checkpoint, "branchBound_longest_path", cg, {"parallel": workers > 1},
+                                    checkpoint_interval)
+            state = ckpt.load() if resume else None
+
+        nodes_sorted = cg.by_degree_desc()
+        N_start = len(nodes_sorted)
+        next_threshold = 5
+        start_count = 0
+
+        initial_path = []
+        if warm_start:
+            metrics.phase("warm_start")
+            initial_path = self._warm_start_path(cg, warm_start, cancel_token=cancel_token)
+            print(f"Incumbente inicial: {len(initial_path)}")
+            self._report_incumbent(progress, len(initial_path), cg.to_names(initial_path), metrics)
+
+        metrics.phase("search")
+        if workers > 1:
+            best_path, best_len, search_count, start_count, table_stats, timed_out = self._parallel_longest_path(
+                nodes_sorted, workers, table_size, cancel_token, progress, metrics, initial_path, ckpt, state)
+            proven_len = best_len
+        else:
+            search = LongestPathSearch(cg, shared_best, table_size, cancel_token, progress, metrics)
+            search.best_path, search.best_len = list(initial_path), len(initial_path)
+            first_index, frontier = 0, None
+            if state is not None:
+                # índice do nó inicial em andamento e a pilha dele (None: começa do zero)
+                first_index, frontier = state["start_index"], state["frontier"]
+                if len(state["best_path"]) > search.best_len:
+                    search.best_path, search.best_len = state["best_path"], len(state["best_path"])
+                search.search_count = state["search_count"]
+                search.bound_prunes, search.table_prunes = state["bound_prunes"], state["table_prunes"]
+            current_index = first_index
+
+            def save(frontier_now):
+                ckpt.save({"start_index": current_index, "frontier": frontier_now, "best_path": search.best_path,
+                           "search_count": search.search_count, "bound_prunes": search.bound_prunes,
+                           "table_prunes": search.table_prunes})
+
+            search.checkpoint, search.on_checkpoint = ckpt, save
+            try:
+                for current_index in range(first_index, N_start):
+                    if search.best_len == N:
+                        break
+                    start_count = current_index + 1
+                    percent = (start_count / N_start) * 100
+                    while percent >= next_threshold:
+                        print(f"{next_threshold}% completo")
+                        self.update_progress(next_threshold, progress)  # Update progress using next_threshold
+                        next_threshold += 5
+                    search.run_from(nodes_sorted[current_index], frontier if current_index == first_index else None)
+                    if ckpt is not None and ckpt.due():
+                        current_index += 1
+                        save(None)
+            except DeadlineExceeded:
+                timed_out = True
+            best_path, best_len, search_count = search.best_path, len(search.best_path), search.search_count
+            # com shared_best o incumbente pode ser de outro processo: é ele o ótimo provado
+            proven_len = search.best_len
+            table_stats = search.table.stats() if search.table else None
+            metrics.prune("reach_bound", search.bound_prunes)
+            metrics.prune("transposition", search.table_prunes)
+
+        if ckpt is not None and not timed_out:
+            ckpt.clear()
+        metrics.phase("bound")
+        bound = cg.longest_path_upper_bound() if timed_out else proven_len
+        self._finish_report(report, best_len, bound, timed_out, search_count=search_count, metrics=metrics)
+        if report is not None and warm_start:
+            report["warm_start"] = len(initial_path)
+
+        best_path = cg.to_names(best_path)
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"Comprimento do trajeto mais longo: {best_len}\n")
+            f.write(f"Trajeto: {best_path}\n")
+
+        print(f"Nos de inicio testados: {start_count}/{N_start} ({round((start_count/N_start)*100)}%)")
+        print(f"Total chamadas recursivas: {search_count}")
+        if table_stats:
+            print(f"Tabela de transposição: {table_stats['hits']} hits, {table_stats['misses']} misses "
+                  f"({table_stats['hit_rate']:.1%})")
+        return best_path, best_len
+
+    # Cada worker recebe nós iniciais sob demanda; o incumbente fica em memória
+    # compartilhada para que um caminho bom achado por um worker poda os outros.
+    # O checkpoint guarda só os nós iniciais já concluídos (a pilha de cada
+    # busca fica dentro do seu worker).
+    def _parallel_longest_path(self, nodes_sorted, workers, table_size, cancel_token=None, progress=None,
+                               metrics=None, initial_path=(), ckpt=None, state=None):
+        N = self.compact.node_count
+        N_start = len(nodes_sorted)
+        best_path = list(initial_path)
+        search_count = 0
+        done = set()
+        if state is not None:
+            done = set(state["done"])
+            search_count = state["search_count"]
+            if len(state["best_path"]) > len(best_path):
+                best_path = state["best_path"]
+        shared_best = multiprocessing.Value("i", len(best_path))
+        start_count = len(done)
+        next_threshold = 5
+        table_stats = {"hits": 0, "misses": 0} if table_size else None
+
+        timed_out = False
+        with multiprocessing.Pool(workers, initializer=_init_longest_path_worker,
+                                  initargs=(self.snapshot_path or self.compact, shared_best, table_size)) as pool:
+            results = pool.imap_unordered(_longest_path_worker, [v for v in nodes_sorted if v not in done])
+            while True:
+                try:
+                    # sair do with (break ou exceção) encerra os workers
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    start, path, count, hits, misses, prunes = results.next(timeout=0.2)
+                except multiprocessing.TimeoutError:
+                    continue
+                except StopIteration:
+                    break
+                except DeadlineExceeded:
+                    timed_out = True
+                    # os inícios já terminados continuam valendo na retomada
+                    if ckpt is not None:
+                        ckpt.save({"done": sorted(done), "best_path": best_path, "search_count": search_count})
+                    break
+                start_count += 1
+                search_count += count
+                done.add(start)
+                if metrics is not None:
+                    for reason, pruned in prunes.items():
+                        metrics.prune(reason, pruned)
+                if table_stats:
+                    table_stats["hits"] += hits
+                    table_stats["misses"] += misses
+                if len(path) > len(best_path):
+                    best_path = path
+                    self._report_incumbent(progress, len(best_path), self.compact.to_names(best_path), metrics)
+                percent = (start_count / N_start) * 100
+                while percent >= next_threshold:
+                    print(f"{next_threshold}% completo")
+                    self.update_progress(next_threshold, progress)
+                    next_threshold += 5
+                if len(best_path) == N:
+                    # caminho hamiltoniano: o with encerra os workers restantes
+                    break
+                if ckpt is not None and ckpt.due():
+                    ckpt.save({"done": sorted(done), "best_path": best_path, "search_count": search_count})
+
+        if table_stats:
+            lookups = table_stats["hits"] + table_stats["misses"]
+            table_stats["hit_rate"] = table_stats["hits"] / lookups if lookups else 0.0
+        return best_path, len(best_path), search_count, start_count, table_stats, timed_out
+
+    # caminho mais longo por decomposição em blocos biconexos
+    def blockCut_solve_longest_path(self, output_file="maior_caminhoBlockCut.txt", cancel_token=None, progress=None,
+                                    time_budget=None, report=None, warm_start=True):
+        cg = self.compact
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+
+        with open(output_file, "w", encoding="utf-8"):
+            pass
+
+        initial_path = []
+        if warm_start:
+            metrics.phase("warm_start")
+            initial_path = self._warm_start_path(cg, warm_start, cancel_token=cancel_token)
+            print(f"Incumbente inicial: {len(initial_path)}")
+            self._report_incumbent(progress, len(initial_path), cg.to_names(initial_path), metrics)
+
+        metrics.phase("search")
+        engine = BlockCutLongestPath(cg, cancel_token, progress, metrics)
+        try:
+            best_path, best_len = engine.solve(initial_path)
+            bound = best_len
+            timed_out = False
+        except DeadlineExceeded:
+            best_path, best_len = engine.best_path, len(engine.best_path)
+            metrics.phase("bound")
+            bound = cg.longest_path_upper_bound()
+            timed_out = True
+        metrics.prune("reach_bound", engine.bound_prunes)
+        self._finish_report(report, best_len, bound, timed_out, search_count=engine.search_count, metrics=metrics)
+
+        best_path = cg.to_names(best_path)
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"Comprimento do trajeto mais longo: {best_len}\n")
+            f.write(f"Trajeto: {best_path}\n")
+
+        print(f"Maior bloco: {engine.largest_block}/{cg.node_count} vertices")
+        print(f"Total chamadas recursivas: {engine.search_count}")
+        return best_path, best_len
+
+    def branchBound_solve_dominating_set(self, output_file="dominantBranch.txt", bounds=None, cancel_token=None,
+                                         progress=None, time_budget=None, report=None, warm_start=None,
+                                         shared_best=None, checkpoint=None, checkpoint_interval=60.0, resume=False):
+        cg = self.compact_by_name
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        timed_out = False
+        adj = cg.adj
+        metrics.phase("kernel")
+        kernel = DominatingSetKernel(cg, cancel_token)
+        elements = kernel.elements
+        candidate_mask = kernel.candidates
+        lower_bounds = DominationBounds(kernel, bounds)
+        cover_mask = lower_bounds.cover_mask
+        N = cg.node_count
+        best_size = candidate_mask.bit_count()
+        best_set = candidate_mask
+        search_count = 0
+        start_count = 0
+
+        # best_set = None: o melhor até agora é o incumbente inicial (que pode
+        # não conter os forçados do kernel), guardado inteiro em warm_mask.
+        # Com shared_best o tamanho pode vir de outro processo, sem solução aqui
+        # (warm_mask também None)
+        forced_count = kernel.forced.bit_count()
+        warm_mask = None
+        if warm_start:
+            metrics.phase("warm_start")
+            warm_mask = self._warm_start_dominating(cg, warm_start, cancel_token=cancel_token)
+            warm_size = warm_mask.bit_count()
+            print(f"Incumbente inicial: {warm_size}")
+            self._report_incumbent(progress, warm_size, cg.mask_to_names(warm_mask), metrics)
+            if warm_size - forced_count < best_size:
+                best_size = warm_size - forced_count
+                best_set = None
+
+        with open(output_file, "w", encoding="utf-8"):
+            pass
+        print(f"Kernel: {kernel.forced.bit_count()} forçados, {best_size} candidatos, "
+              f"{elements.bit_count()} vértices a dominar")
+
+        # candidatos que cobrem o elemento target: ele mesmo e seus vizinhos
+        def candidates_for(target, excluded):
+            allowed = candidate_mask & ~excluded
+            return [u for u in [target] + adj[target] if (allowed >> u) & 1]
+
+        frames = [_DomFrame() for _ in range(N + 1)]
+        ckpt = state = None
+        checkpoint_due = False
+        if checkpoint:
+            ckpt = SearchCheckpoint(checkpoint, "branchBound_dominating_set", cg, interval=checkpoint_interval)
+            state = ckpt.load() if resume else None
+
+        # Cada frame guarda só (candidatos, índice): as máscaras saem de novo
+        # refazendo as escolhas a partir do nó inicial (restore), então o
+        # checkpoint não cresce com profundidade x N bits.
+        def save(start_index, depth):
+            ckpt.save({"start_index": start_index,
+                       "frames": [[frames[i].candidates, frames[i].index] for i in range(depth + 1)],
+                       "best_size": best_size, "best_set": SearchCheckpoint.pack_mask(best_set),
+                       "warm_mask": SearchCheckpoint.pack_mask(warm_mask),
+                       "search_count": search_count, "pruned": lower_bounds.pruned})
+
+        # o filho do frame d foi criado por candidates[index - 1], com os irmãos
+        # anteriores já excluídos; o próprio frame exclui todos até index
+        def restore(start, excluded, saved_frames):
+            chosen, size, dominated = 1 << start, 1, cover_mask[start]
+            for depth, (candidates, index) in enumerate(saved_frames):
+                frame = frames[depth]
+                frame.chosen, frame.size, frame.dominated = chosen, size, dominated
+                frame.candidates, frame.index = candidates, index
+                for u in candidates[:max(index - 1, 0)]:
+                    excluded |= 1 << u
+                frame.excluded = excluded
+                if index:
+                    u = candidates[index - 1]
+                    frame.excluded |= 1 << u
+                    chosen, size, dominated = chosen | (1 << u), size + 1, dominated | cover_mask[u]
+
+        def dfs_dom(current_set, current_size, dominated_mask, excluded, depth=-1):
+            nonlocal best_size, best_set, warm_mask, search_count, checkpoint_due
+            pending = depth < 0
+            while True:
+                if pending:
+                    pending = False
+                    search_count += 1
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    if search_count % CancellationToken.CHECK_INTERVAL == 0:
+                        checkpoint_due = ckpt is not None and ckpt.due()
+                        if shared_best is not None and shared_best.value - forced_count < best_size:
+                            best_size = shared_best.value - forced_count
+                            best_set = warm_mask = None
+                    candidates = None
+                    if dominated_mask == elements:
+                        if current_size < best_size:
+                            best_size = current_size
+                            best_set = current_set
+                            self._report_incumbent(progress, best_size + kernel.forced.bit_count(),
+                                                   cg.mask_to_names(best_set | kernel.forced), metrics)
+                    else:
+                        free = elements & ~dominated_mask
+                        if not lower_bounds.prunes(free, candidate_mask & ~excluded, best_size - current_size):
+                            # primeiro vértice ainda não dominado
+                            target = (free & -free).bit_length() - 1
+                            candidates = candidates_for(target, excluded)
+                    if candidates:
+                        depth += 1
+                        frame = frames[depth]
+                        frame.chosen = current_set
+                        frame.size = current_size
+                        frame.dominated = dominated_mask
+                        frame.excluded = excluded
+                        frame.candidates = candidates
+                        frame.index = 0
+                    elif depth < 0:
+                        return
+
+                if checkpoint_due:
+                    checkpoint_due = False
+                    save(start_index, depth)
+                frame = frames[depth]
+                candidates = frame.candidates
+                if frame.index < len(candidates):
+                    u = candidates[frame.index]
+                    frame.index += 1
+                    # irmãos seguintes não voltam a escolher u (sem ramos repetidos)
+                    excluded = frame.excluded
+                    frame.excluded |= 1 << u
+                    current_set = frame.chosen | (1 << u)
+                    current_size = frame.size + 1
+                    dominated_mask = frame.dominated | cover_mask[u]
+                    pending = True
+                    continue
+
+                depth -= 1
+                if depth < 0:
+                    return
+
+        if elements:
+            root = (elements & -elements).bit_length() - 1
+            starts = candidates_for(root, 0)
+        else:
+            best_size, best_set, starts = 0, 0, []
+            self._report_incumbent(progress, kernel.forced.bit_count(), cg.mask_to_names(kernel.forced), metrics)
+        N_start = len(starts)
+        next_threshold = 5
+        excluded = 0
+        first_index = 0
+        if state is not None:
+            first_index = state["start_index"]
+            if state["best_size"] < best_size:
+                best_size = state["best_size"]
+                best_set = SearchCheckpoint.unpack_mask(state["best_set"])
+                warm_mask = SearchCheckpoint.unpack_mask(state["warm_mask"])
+            search_count = state["search_count"]
+            lower_bounds.pruned.update(state["pruned"])
+            for v in starts[:first_index]:
+                excluded |= 1 << v
+        metrics.phase("search")
+        try:
+            for start_index in range(first_index, N_start):
+                v = starts[start_index]
+                if best_size == 1:
+                    break
+                start_count = start_index + 1
+                percent = (start_count / N_start) * 100
+                while percent >= next_threshold:
+                    print(f"{next_threshold}%")
+                    self.update_progress(next_threshold, progress)
+                    next_threshold += 5
+                if start_index == first_index and state is not None and state["frames"]:
+                    # retoma a pilha salva do nó inicial em andamento
+                    restore(v, excluded, state["frames"])
+                    dfs_dom(None, None, None, None, len(state["frames"]) - 1)
+                else:
+                    dfs_dom(1 << v, 1, cover_mask[v], excluded)
+                excluded |= 1 << v
+                if ckpt is not None and ckpt.due():
+                    save(start_index + 1, -1)
+        except DeadlineExceeded:
+            timed_out = True
+        if ckpt is not None and not timed_out:
+            ckpt.clear()
+
+        best_size += kernel.forced.bit_count()
+        best_mask = warm_mask if best_set is None else best_set | kernel.forced
+        for name, pruned in lower_bounds.pruned.items():
+            metrics.prune(f"bound_{name}", pruned)
+        if timed_out:
+            metrics.phase("bound")
+            root_bound = DominationBounds(kernel, DominationBounds.AVAILABLE).lower_bound(elements, candidate_mask)
+            self._finish_report(report, best_size, kernel.forced.bit_count() + root_bound, True,
+                                search_count=search_count, metrics=metrics)
+        else:
+            self._finish_report(report, best_size, best_size, False, search_count=search_count, metrics=metrics)
+        if report is not None and warm_start:
+            report["warm_start"] = warm_size
+        best_set = set(cg.mask_to_names(best_mask)) if best_mask is not None else None
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"Tamanho mínimo do conjunto dominante: {best_size}\n")
+            if best_set is not None:
+                f.write(f"Conjunto dominante: {sorted(best_set)}\n")
+
+        print(f"Nós de inicio testados: {start_count}/{N_start} ({round((start_count/N_start)*100) if N_start else 100}%)")
+        print(f"Chamadas recursivas: {search_count}")
+        print(f"Podas por limite inferior: {lower_bounds.pruned}")
+        return best_set, best_size
+
+    def greedy_solve_longest_path(self, output_file="maior_caminhoGreedy.txt", both_ends=True, cancel_token=None,
+                                  progress=None, time_budget=None, report=None):
+        cg = self.compact
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        timed_out = False
+        best_len = 0
+        best_path = []
+
+        with open(output_file, "w", encoding="utf-8"):
+            pass
+
+        start_count = 0
+
+        nodes_sorted = cg.by_degree_desc()
+        N_start = len(nodes_sorted)
+        next_threshold = 5
+        engine = GreedyLongestPath(cg, both_ends)
+
+        metrics.phase("search")
+        for v in nodes_sorted:
+            if best_len == cg.node_count:
+                break
+            start_count += 1
+            percent = (start_count / N_start) * 100
+            while percent >= next_threshold:
+                print(f"{next_threshold}%")
+                self.update_progress(next_threshold, progress)
+                next_threshold += 5
+
+            path_local = engine.run(v)
+            if len(path_local) > best_len:
+                best_len = len(path_local)
+                best_path = path_local
+                self._report_incumbent(progress, best_len, cg.to_names(best_path), metrics)
+            if cancel_token is not None:
+                try:
+                    cancel_token.check()
+                except DeadlineExceeded:
+                    timed_out = True
+                    break
+
+        metrics.phase("bound")
+        self._finish_report(report, best_len, cg.longest_path_upper_bound(), timed_out, search_count=engine.steps,
+                            metrics=metrics)
+
+        best_path = cg.to_names(best_path)
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"Caminho mais longo {best_len}\n")
+            f.write(f"Caminho: {best_path}\n")
+
+        print(f"Nos iniciais testados: {start_count}/{N_start} ({round((start_count/N_start)*100)}%)")
+        print(f"Chamadas recursivas: {engine.steps}")
+        return best_path, best_len
+
+    # O primeiro nó de maior grau (menor id no empate) é a escolha do guloso
+    # puro, então a primeira execução é o guloso simples; as outras starts - 1
+    # são recomeços semeados pelos próximos nós de maior grau. Cada execução é
+    # linear, e não uma por vértice do grafo.
+    def greedy_solve_dominating_set(self, output_file="dominantGreedy.txt", cancel_token=None, progress=None,
+                                    time_budget=None, report=None, starts=8):
+        cg = self.compact_by_name
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        metrics = SolverMetrics()
+        timed_out = False
+        N = cg.node_count
+
+        with open(output_file, "w", encoding="utf-8"):
+            pass
+
+        best_size = N
+        best_set = list(range(N))
+        start_count = 0
+
+        seeds = cg.by_degree_desc()[:starts]
+        N_start = len(seeds)
+        next_threshold = 5
+        engine = GreedyDominatingSet(cg)
+
+        metrics.phase("search")
+        for v in seeds:
+            start_count += 1
+            percent = (start_count / N_start) * 100
+            while percent >= next_threshold:
+                print(f"{next_threshold}%")
+                self.update_progress(next_threshold, progress)
+                next_threshold += 5
+
+            current_set = engine.run(v)
+            if len(current_set) < best_size:
+                best_size = len(current_set)
+                best_set = current_set
+                self._report_incumbent(progress, best_size, cg.to_names(best_set), metrics)
+            if cancel_token is not None:
+                try:
+                    cancel_token.check()
+                except DeadlineExceeded:
+                    timed_out = True
+                    break
+
+        self._finish_report(report, best_size, None, timed_out, proven=False, search_count=engine.steps,
+                            metrics=metrics)
+
+        best_set = set(cg.to_names(best_set))
+        with open(output_file, "a", encoding="utf-8") as f:
+            f.write(f"Tamanho aproximado do set dominante: {best_size}\n")
+            f.write(f"set dominante: {sorted(best_set)}\n")
+
+        print(f"Nos de inicio testados: {start_count}/{N_start} ({round((start_count/N_start)*100) if N_start else 100}%)")
+        print(f"Chamadas recursivas gulosas: {engine.steps}")
+        return best_set, best_size
+
+    # Portfólio: os motores correm em paralelo, um processo cada, e param assim
+    # que o melhor incumbente encontra o limite provado por algum deles (ou o
+    # prazo acaba). O relatório diz quem achou a solução (winner) e quem fechou
+    # o gap (proved_by).
+    def portfolio_solve_longest_path(self, output_file="maior_caminhoPortfolio.txt", engines=None, cancel_token=None,
+                                     progress=None, time_budget=None, report=None):
+        best_path, best_len = self._portfolio("A", engines, {}, cancel_token, progress, time_budget, report)
+        best_path = best_path or []
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(f"Comprimento do trajeto mais longo: {best_len}\n")
+            f.write(f"Trajeto: {best_path}\n")
+        return best_path, best_len
+
+    def portfolio_solve_dominating_set(self, output_file="dominantPortfolio.txt", engines=None, bounds=None,
+                                       cancel_token=None, progress=None, time_budget=None, report=None):
+        best_set, best_size = self._portfolio("B", engines, {"bounds": bounds}, cancel_token, progress, time_budget,
+                                              report)
+        best_set = set(best_set or ())
+        with open(output_file, "w", encoding="utf-8") as f:
+            f.write(f"Tamanho mínimo do conjunto dominante: {best_size}\n")
+            f.write(f"Conjunto dominante: {sorted(best_set)}\n")
+        return best_set, best_size
+
+    def _portfolio(self, problem, engines, exact_kwargs, cancel_token, progress, time_budget, report):
+        available = self.PORTFOLIO_ENGINES[problem]
+        engines = list(available) if engines is None else list(dict.fromkeys(engines))
+        unknown = [engine for engine in engines if engine not in available]
+        if unknown or not engines:
+            raise ValueError(f"Motores inválidos para o problema {problem}: {', '.join(unknown) or 'nenhum'}")
+        maximize = problem == "A"
+        cancel_token = CancellationToken.with_budget(cancel_token, time_budget)
+        deadline = cancel_token.deadline if cancel_token is not None else None
+        metrics = SolverMetrics()
+        metrics.phase("portfolio")
+
+        shared_best = multiprocessing.Value("i", 0 if maximize else self.node_count)
+        stop_event = multiprocessing.Event()
+        events = multiprocessing.Queue()
+        source = self.snapshot_path or self.compact
+        budget = None if deadline is None else max(0.0, deadline - time.monotonic())
+        processes = {}
+        for engine in engines:
+            kwargs = dict(exact_kwargs, shared_best=shared_best) if engine == "branch_and_bound" else {}
+            process = multiprocessing.Process(
+                target=_portfolio_worker, daemon=True,
+                args=(source, engine, available[engine], kwargs, shared_best, stop_event, events, budget, maximize))
+            process.start()
+            processes[engine] = process
+
+        best_value, best_solution, winner = None, None, None
+        bound, proved_by = None, None
+        engine_reports = {engine: {"status": "running"} for engine in engines}
+        search_count = 0
+
+        def handle(message):
+            nonlocal best_value, best_solution, winner, bound, proved_by, search_count
+            kind, engine = message[0], message[1]
+            if kind == "incumbent":
+                _, _, value, solution = message
+                if best_value is None or ((value > best_value) if maximize else (value < best_value)):
+                    best_value, best_solution, winner = value, solution, engine
+                    self._report_incumbent(progress, value, solution, metrics)
+                return
+            entry = engine_reports[engine]
+            entry["status"] = kind
+            if kind == "failed":
+                entry["error"] = message[2]
+            elif kind == "done":
+                engine_report = message[2]
+                entry.update(value=engine_report.get("value"), bound=engine_report.get("bound"),
+                             timed_out=engine_report.get("timed_out"), search_count=engine_report.get("search_count"))
+                search_count += engine_report.get("search_count") or 0
+                engine_bound = engine_report.get("bound")
+                if engine_bound is not None and (bound is None or ((engine_bound < bound) if maximize
+                                                                   else (engine_bound > bound))):
+                    bound, proved_by = engine_bound, engine
+
+        cancelled = False
+        try:
+            running = len(engines)
+            while running:
+                if cancel_token is not None and cancel_token.cancelled:
+                    cancelled = True
+                    break
+                # no prazo os motores param sozinhos e mandam o relatório com o limite
+                if deadline is not None and time.monotonic() > deadline + self.PORTFOLIO_GRACE:
+                    break
+                try:
+                    message = events.get(timeout=0.1)
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes.values()) and events.empty():
+                        break
+                    continue
+                handle(message)
+                if message[0] != "incumbent":
+                    running -= 1
+                if best_value is not None and best_value == bound:
+                    break
+        finally:
+            stop_event.set()
+            # esvazia a fila enquanto os motores encerram: um processo com itens
+            # ainda não lidos na fila não termina
+            grace_end = time.monotonic() + self.PORTFOLIO_GRACE
+            while any(process.is_alive() for process in processes.values()) and time.monotonic() < grace_end:
+                try:
+                    handle(events.get(timeout=0.1))
+                except queue.Empty:
+                    pass
+            for process in processes.values():
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+            while True:
+                try:
+                    handle(events.get_nowait())
+                except queue.Empty:
+                    break
+        if cancelled:
+            raise SolverCancelled("Execução cancelada.")
+
+        for entry in engine_reports.values():
+            if entry["status"] == "running":
+                entry["status"] = "cancelled"
+        proven = best_value is not None and best_value == bound
+        timed_out = not proven and (deadline is not None and time.monotonic() >= deadline
+                                    or any(entry.get("timed_out") for entry in engine_reports.values()))
+        if not proven:
+            proved_by = None
+        print(f"Portfólio: vencedor {winner}, ótimo provado por {proved_by}")
+        self._finish_report(report, best_value, bound, timed_out, proven=proven, search_count=search_count,
+                            metrics=metrics)
+        if report is not None:
+            report.update(winner=winner, proved_by=proved_by, engines=engine_reports)
+        return best_solution, best_value
+
+    def apply_greedy_approximation(self):
+        def find_farthest_path(start_vertex, blocked_vertices=set()):
+            explored = set()
+            parent_map = {}
+            distance_map = {}
+            
+            def depth_search(vertex, depth):
+                explored.add(vertex)
+                distance_map[vertex] = depth
+                stack = [(vertex, depth, iter(self.graph.neighbors(vertex)))]
+                while stack:
+                    vertex, depth, neighbors = stack[-1]
+                    for adjacent in neighbors:
+                        if adjacent not in explored and adjacent not in blocked_vertices:
+                            parent_map[adjacent] = vertex
+                            explored.add(adjacent)
+                            distance_map[adjacent] = depth + 1
+                            stack.append((adjacent, depth + 1, iter(self.graph.neighbors(adjacent))))
+                            break
+                    else:
+                        stack.pop()
+            
+            depth_search(start_vertex, 0)
+            if not distance_map:
+                return [], None
+            
+            farthest_vertex = max(distance_map, key=distance_map.get)
+            path_reconstruction = []
+            current = farthest_vertex
+            
+            while current != start_vertex:
+                path_reconstruction.append(current)
+                current = parent_map[current]
+            path_reconstruction.append(start_vertex)
+            path_reconstruction.reverse()
+            
+            return path_reconstruction, farthest_vertex
+        
+        initial_vertex = next((v for v in self.graph.nodes() if self.graph.degree(v) == 1), 
+                             list(self.graph.nodes())[0])
+        
+        first_path, endpoint = find_farthest_path(initial_vertex)
+        used_vertices = set(first_path)
+        used_vertices.discard(endpoint)
+        
+        second_path, _ = find_farthest_path(endpoint, used_vertices)
+        
+        if len(second_path) > 1 and self.graph.has_edge(first_path[-1], second_path[1]):
+            complete_path = first_path + second_path[1:]
+        else:
+            complete_path = first_path
+        
+        with open("resultados/maior_caminho.txt", "a") as output:
+            output.write(f"Caminho simples aproximado com {len(complete_path)} vértices:\n")
+            output.write(f"{complete_path}\n")
+
+    # Incumbente inicial dos branch and bound: True roda o guloso a partir dos
+    # starts nós de maior grau; uma lista de estações é validada e usada como está.
+    def _warm_start_path(self, cg, warm_start, starts=64, cancel_token=None):
+        if warm_start is True:
+            engine = GreedyLongestPath(cg)
+            runs = self._greedy_runs(engine, cg.by_degree_desc()[:starts], cancel_token)
+            return max(runs, key=len, default=[])
+        ids = self._names_to_ids(cg, warm_start)
+        if len(set(ids)) != len(ids) or any(v not in cg.adj[u] for u, v in zip(ids, ids[1:])):
+            raise ValueError("Incumbente inicial não é um caminho simples do grafo.")
+        return ids
+
+    def _warm_start_dominating(self, cg, warm_start, starts=64, cancel_token=None):
+        if warm_start is True:
+            engine = GreedyDominatingSet(cg)
+            runs = self._greedy_runs(engine, cg.by_degree_desc()[:starts], cancel_token)
+            best = min(runs, key=len, default=None)
+            return cg.full_mask if best is None else cg.ids_to_mask(best)
+        mask = covered = 0
+        for v in self._names_to_ids(cg, warm_start):
+            mask |= 1 << v
+            covered |= cg.closed_mask[v]
+        if covered != cg.full_mask:
+            raise ValueError("Incumbente inicial não domina todos os vértices.")
+        return mask
+
+    # Uma execução do guloso por nó inicial; com o prazo esgotado para depois da
+    # primeira (o incumbente sempre existe). Cancelamento continua subindo.
+    @staticmethod
+    def _greedy_runs(engine, starts, cancel_token=None):
+        for i, v in enumerate(starts):
+            if i and cancel_token is not None:
+                try:
+                    cancel_token.check()
+                except DeadlineExceeded:
+                    return
+            yield engine.run(v)
+
+    @staticmethod
+    def _names_to_ids(cg, names):
+        unknown = [name for name in names if name not in cg.index]
+        if unknown:
+            raise ValueError(f"Estações desconhecidas no incumbente inicial: {', '.join(map(str, unknown))}")
+        return [cg.index[name] for name in names]
+
+    def _write_path_result(self, path, filename):
+        if path:
+            with open(filename, "a", encoding="utf-8") as file:
+                file.write(f"Trajeto mais longo com {len(path)} vértices:\n")
+                file.write(f"{path}\n")
+        else:
+            print("Trajeto válido não encontrado.")
+
+    def _serialize_result(self, result):
+        if isinstance(result, set):
+            return list(result)
+        elif isinstance(result, dict):
+            return {key: self._serialize_result(value) for key, value in result.items()}
+        elif isinstance(result, (list, tuple)):
+            return [self._serialize_result(item) for item in result]
+        return result
+
+    def update_progress(self, new_progress, progress=None):
+        if progress is not None:
+            progress.progress(new_progress)
+        print(f"Progress updated: {new_progress}")
+
+    # Preenche o relatório da execução: ótimo provado, tempo esgotado e o gap
+    # entre a solução e o melhor limite conhecido (quando existe).
+    def _finish_report(self, report, value, bound, timed_out, proven=None, search_count=None, metrics=None):
+        gap = None if bound is None or value is None else abs(bound - value)
+        optimal = proven if proven is not None else gap == 0
+        if timed_out:
+            gap_text = "desconhecido" if gap is None else gap
+            print(f"Tempo esgotado: melhor solução encontrada {value} (limite {bound}, gap {gap_text})")
+        if report is not None:
+            report.update(value=value, optimal=optimal, timed_out=timed_out, bound=bound, gap=gap,
+                          search_count=search_count)
+            if metrics is not None:
+                metrics.nodes_expanded = search_count or 0
+                report["metrics"] = metrics.to_dict()
+
+    def _report_incumbent(self, progress, value, solution, metrics=None):
+        if metrics is not None:
+            metrics.incumbent(value)
+        if progress is not None:
+            progress.incumbent(value, solution)
+
+class GraphBuilder:
+    @staticmethod
+    def load_station_data(file_path):
+        station_dict = {}
+        
+        with open(file_path, encoding="utf-8") as file_handle:
+            for raw_line in file_handle:
+                cleaned_line = raw_line.strip()
+                if not cleaned_line:
+                    continue
+                
+                station_name, x_coordinate, y_coordinate = cleaned_line.rsplit(" ", 2)
+                coordinates = float(x_coordinate), float(y_coordinate)
+                station_dict[station_name] = coordinates
+        
+        return station_dict
+    
+    @staticmethod
+    def load_line_data(file_path):
+        line_collection = []
+        current_name = current_color = None
+        connection_list = []
+        
+        with open(file_path, encoding="utf-8") as file_handle:
+            for processed_line in file_handle:
+                processed_line = processed_line.strip()
+                if not processed_line:
+                    continue
+                
+                if processed_line.lower().startswith("linha"):
+                    if current_name is not None:
+                        line_collection.append((current_name, current_color, connection_list))
+                        connection_list = []
+                    
+                    parts = processed_line.split(",")
+                    current_name = parts[0].strip()
+                    current_color = parts[1].strip() if len(parts) > 1 else "black"
+                    continue
+                
+                if ";" in processed_line:
+                    station_a, station_b = (token.strip() for token in processed_line.split(";", 1))
+                    connection_list.append((station_a, station_b))
+        
+        if current_name is not None:
+            line_collection.append((current_name, current_color, connection_list))
+        
+        return line_collection
+    
+    @staticmethod
+    def construct_network(station_data, line_data):
+        import networkx as nx
+
+        network = nx.Graph()
+        network.add_nodes_from((name, {"pos": position}) for name, position in station_data.items())
+        
+        for line_identifier, line_color, edge_connections in line_data:
+            for node_u, node_v in edge_connections:
+                if node_u in station_data and node_v in station_data:
+                    network.add_edge(node_u, node_v, cor=line_color, linha=line_identifier)
+        
+        return network
+
+    # Valida o payload do /initialize: {nome: [x, y]} e [[linha, cor, [[a, b], ...]], ...],
+    # o mesmo formato que o frontend monta a partir dos arquivos.
+    @staticmethod
+    def parse_payload(stations, lines):
+        if not isinstance(stations, dict) or not isinstance(lines, list):
+            raise ValueError("Esperado stations como objeto e lines como lista.")
+        station_data = {}
+        for name, position in stations.items():
+            x_coordinate, y_coordinate = position
+            station_data[str(name)] = float(x_coordinate), float(y_coordinate)
+        line_data = []
+        for line_name, line_color, edge_connections in lines:
+            connection_list = [(str(station_a), str(station_b)) for station_a, station_b in edge_connections]
+            line_data.append((str(line_name), str(line_color or "black"), connection_list))
+        return station_data, line_data
+
+    # Hash canônico da topologia: só nomes e arestas influenciam os solvers.
+    @staticmethod
+    def fingerprint(network):
+        digest = hashlib.sha256()
+        for name in sorted(network.nodes()):
+            digest.update(f"v {name}\n".encode("utf-8"))
+        for u, v in sorted(tuple(sorted(edge)) for edge in network.edges()):
+            digest.update(f"e {u};{v}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+# Snapshot binário do grafo, lido via mmap sem parse de texto:
+#   cabeçalho | coords f64[2n] | indptr u32[n+1] | indices u32[E] | linha da aresta u32[E]
+#   | (nome, cor) das linhas u32[2L] | offsets das strings u32[S+1] | blob utf-8
+# As strings são internadas: ids 0..n-1 são as estações, o resto nomes e cores
+# das linhas. A adjacência em CSR segue a ordem de inserção do networkx, então
+# o CompactGraph gerado tem os mesmos ids do construído a partir do nx.Graph.
+# O mmap em si é imediato, mas os solvers trabalham sobre o CompactGraph:
+# to_compact copia nomes e vizinhanças para listas do processo, então cada
+# worker de um Pool paga essa montagem e guarda sua própria cópia; as páginas
+# do arquivo só são lidas durante a cópia. Usar fatias (memoryview) de indices
+# como linhas de adj gasta mais memória (184 bytes por fatia contra ~72 de uma
+# lista curta) e deixa o branch and bound uns 15% mais lento, por isso listas.
+class GraphSnapshot:
+    MAGIC = b"PAAGRAF1"
+    VERSION = 1
+    HEADER = struct.Struct("<8sIIIII4x")
+
+    def __init__(self, buffer, path=None, mapped=None):
+        magic, version, n, entries, line_count, string_count = self.HEADER.unpack_from(buffer, 0)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError("Arquivo não é um snapshot de grafo válido.")
+        self.path = path
+        self._mapped = mapped
+        self.node_count = n
+        self.edge_count = entries // 2
+        view = memoryview(buffer)
+        offset = self.HEADER.size
+        self.coords, offset = self._section(view, offset, "d", 2 * n)
+        self.indptr, offset = self._section(view, offset, "I", n + 1)
+        self.indices, offset = self._section(view, offset, "I", entries)
+        self.edge_line, offset = self._section(view, offset, "I", entries)
+        self.line_strings, offset = self._section(view, offset, "I", 2 * line_count)
+        self.string_offsets, offset = self._section(view, offset, "I", string_count + 1)
+        self.blob = view[offset:offset + self.string_offsets[string_count]]
+        self.line_count = line_count
+
+    @staticmethod
+    def _section(view, offset, typecode, count):
+        size = array(typecode).itemsize * count
+        chunk = view[offset:offset + size]
+        if sys.byteorder == "little":
+            return chunk.cast(typecode), offset + size
+        values = array(typecode, chunk)
+        values.byteswap()
+        return values, offset + size
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapped, str(path), mapped)
+
+    def string(self, i):
+        return bytes(self.blob[self.string_offsets[i]:self.string_offsets[i + 1]]).decode("utf-8")
+
+    def names(self):
+        return [self.string(i) for i in range(self.node_count)]
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i + 1]]
+
+    def to_compact(self):
+        return CompactGraph(self.names(), (self.neighbors(i) for i in range(self.node_count)))
+
+    def to_networkx(self):
+        import networkx as nx
+
+        names = self.names()
+        lines = [(self.string(self.line_strings[2 * k]), self.string(self.line_strings[2 * k + 1]))
+                 for k in range(self.line_count)]
+        network = nx.Graph()
+        network.add_nodes_from((name, {"pos": (self.coords[2 * i], self.coords[2 * i + 1])})
+                               for i, name in enumerate(names))
+        for i in range(self.node_count):
+            for entry in range(self.indptr[i], self.indptr[i + 1]):
+                j = self.indices[entry]
+                if i <= j:
+                    line_identifier, line_color = lines[self.edge_line[entry]]
+                    network.add_edge(names[i], names[j], cor=line_color, linha=line_identifier)
+        return network
+
+    # Mesmo hash de GraphBuilder.fingerprint, sem montar o nx.Graph.
+    def fingerprint(self):
+        names = self.names()
+        digest = hashlib.sha256()
+        for name in sorted(names):
+            digest.update(f"v {name}\n".encode("utf-8"))
+        edges = sorted(tuple(sorted((names[i], names[j])))
+                       for i in range(self.node_count) for j in self.neighbors(i) if i <= j)
+        for u, v in edges:
+            digest.update(f"e {u};{v}\n".encode("utf-8"))
+        return digest.hexdigest()
+
+    def close(self):
+        for attr in ("coords", "indptr", "indices", "edge_line", "line_strings", "string_offsets", "blob"):
+            value = getattr(self, attr)
+            if isinstance(value, memoryview):
+                value.release()
+        if self._mapped is not None:
+            self._mapped.close()
+
+    @classmethod
+    def write(cls, path, station_data, line_data):
+        strings = {}
+
+        def intern(text):
+            return strings.setdefault(text, len(strings))
+
+        for name in station_data:
+            intern(name)
+        # dict por vértice: ordem da primeira inserção e linha da última, como no nx.Graph
+        neighbor_lines = [{} for _ in station_data]
+        line_strings = array("I")
+        for line_id, (line_identifier, line_color, edge_connections) in enumerate(line_data):
+            line_strings.extend((intern(line_identifier), intern(line_color)))
+            for node_u, node_v in edge_connections:
+                if node_u in station_data and node_v in station_data:
+                    u, v = strings[node_u], strings[node_v]
+                    neighbor_lines[u][v] = line_id
+                    neighbor_lines[v][u] = line_id
+
+        coords = array("d")
+        for x_coordinate, y_coordinate in station_data.values():
+            coords.extend((x_coordinate, y_coordinate))
+        indptr, indices, edge_line = array("I", [0]), array("I"), array("I")
+        for row in neighbor_lines:
+            indices.extend(row.keys())
+            edge_line.extend(row.values())
+            indptr.append(len(indices))
+        encoded = [text.encode("utf-8") for text in strings]
+        string_offsets = array("I", [0])
+        for chunk in encoded:
+            string_offsets.append(string_offsets[-1] + len(chunk))
+
+        header = cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(station_data), len(indices),
+                                 len(line_data), len(strings))
+        sections = [coords, indptr, indices, edge_line, line_strings, string_offsets]
+        if sys.byteorder != "little":
+            for section in sections:
+                section.byteswap()
+        with open(path, "wb") as f:
+            f.write(header)
+            for section in sections:
+                section.tofile(f)
+            f.write(b"".join(encoded))
+
+    @classmethod
+    def convert(cls, stations_path, lines_path, output_path):
+        cls.write(output_path, GraphBuilder.load_station_data(stations_path), GraphBuilder.load_line_data(lines_path))
+
+class GraphVisualizer:
+    @staticmethod
+    def _normalize_color(color_name):
+        color_mapping = {
+            'yellow': 'gold',
+            'blue': 'blue',
+            'purple': 'purple',
+            'lightgreen': 'lightgreen',
+            'pink': 'pink',
+            'olive': 'olive',
+            'sienna': 'sienna',
+            'brown': 'brown',
+            'darkgreen': 'darkgreen',
+            'indigo': 'indigo'
+        }
+        return color_mapping.get(color_name.lower(), 'gray')
+    
+    @staticmethod
+    def render_network(network, output_path="grafo_metro.png", resolution=300):
+        # matplotlib só é carregado quando algo é desenhado
+        import networkx as nx
+        from matplotlib import pyplot as plt
+
+        position_data = nx.get_node_attributes(network, "pos")
+        color_grouped_edges = defaultdict(list)
+        
+        for node_u, node_v, edge_data in network.edges(data=True):
+            normalized_color = GraphVisualizer._normalize_color(edge_data["cor"])
+            color_grouped_edges[normalized_color].append((node_u, node_v))
+        
+        plt.figure(figsize=(14, 10))
+        nx.draw_networkx_nodes(network, position_data, node_size=300, node_color="lightgray")
+        nx.draw_networkx_labels(network, position_data, font_size=8)
+        
+        for edge_color, edge_list in color_grouped_edges.items():
+            nx.draw_networkx_edges(network, position_data, edgelist=edge_list, width=2, edge_color=edge_color)
+        
+        plt.axis("off")
+        plt.tight_layout()
+        plt.savefig(output_path, dpi=resolution)
+        plt.close()
+        print(f"Grafo salvo em {output_path}.")
+
+def read_stations(path):
+    return GraphBuilder.load_station_data(path)
+
+def read_lines(path):
+    return GraphBuilder.load_line_data(path)
+
+def build_graph(stations, metro_lines):
+    return GraphBuilder.construct_network(stations, metro_lines)
+
+def draw_graph(g, out_file="grafo_metro.png", dpi=300):
+    GraphVisualizer.render_network(g, out_file, dpi)
@@ -0,0 +1,596 @@
+'''
+Trabalho PAA - Caixeiro Viajante
+Integrantes:
+
+Vinicius Dutra Goddard
+Victor Hugo Braz
+
+'''
+
+# API Flask: registro de grafos, cache de resultados e jobs em segundo plano.
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from flask import Flask, request, jsonify, Response
+from flask_cors import CORS
+import threading
+import time
+import json
+import math
+import uuid
+import hashlib
+import os
+import shutil
+
+from metro_core import (CancellationToken, GraphBuilder, GraphSnapshot, MetroSolver, ProgressChannel,
+                        SolverCancelled, read_lines, read_stations)
+
+app = Flask(__name__)
+CORS(app, resources={r"/*": {"origins": "*"}})
+
+# Grafos registrados pelo hash da topologia. Cada um guarda o seu MetroSolver,
+# construído uma única vez e compartilhado (sem cópia) pelos jobs que rodam
+# sobre ele; os menos usados recentemente são descartados além de max_graphs.
+class GraphRegistry:
+    def __init__(self, max_graphs=16):
+        self.max_graphs = max_graphs
+        self.solvers = OrderedDict()
+        self.lock = threading.Lock()
+
+    def register(self, graph):
+        return self._register(GraphBuilder.fingerprint(graph), lambda: MetroSolver(graph))
+
+    def register_snapshot(self, snapshot):
+        return self._register(snapshot.fingerprint(), lambda: MetroSolver.from_snapshot(snapshot))
+
+    def _register(self, graph_id, build):
+        with self.lock:
+            if graph_id in self.solvers:
+                self.solvers.move_to_end(graph_id)
+                return graph_id, self.solvers[graph_id]
+        solver = build()
+        with self.lock:
+            solver = self.solvers.setdefault(graph_id, solver)
+            self.solvers.move_to_end(graph_id)
+            while len(self.solvers) > self.max_graphs:
+                self.solvers.popitem(last=False)
+        return graph_id, solver
+
+    def get(self, graph_id):
+        with self.lock:
+            solver = self.solvers.get(graph_id)
+            if solver is not None:
+                self.solvers.move_to_end(graph_id)
+            return solver
+
+graphs = GraphRegistry()
+
+@app.route('/initialize', methods=['POST'])
+def initialize():
+    print("/initialize endpoint hit")
+    data = request.get_json(silent=True) or {}
+    if 'snapshot' in data:
+        return initialize_snapshot(data['snapshot'])
+    if 'stations' in data or 'lines' in data:
+        try:
+            station_data, line_data = GraphBuilder.parse_payload(data.get('stations'), data.get('lines'))
+        except (TypeError, ValueError) as e:
+            print(f"Erro: payload inválido: {e}")
+            return jsonify({"error": f"Payload inválido: {e}"}), 400
+    else:
+        # sem payload usa os arquivos do diretório, como na versão de linha de comando
+        station_data = read_stations("./estacoes.txt")
+        line_data = read_lines("./linhas.txt")
+
+    if not station_data or not line_data:
+        print("Erro: Dados de estações ou linhas estão vazios.")
+        return jsonify({"error": "Dados de estações ou linhas estão vazios."}), 400
+
+    graph = GraphBuilder.construct_network(station_data, line_data)
+    if graph.number_of_nodes() == 0 or graph.number_of_edges() == 0:
+        print("Erro: Grafo construído está vazio.")
+        return jsonify({"error": "Grafo construído está vazio."}), 400
+
+    graph_id, _ = graphs.register(graph)
+    print(f"Grafo {graph_id[:12]} inicializado com {graph.number_of_nodes()} nós e {graph.number_of_edges()} arestas.")
+    return jsonify({"message": "Grafo inicializado com sucesso.", "graph_id": graph_id,
+                    "nodes": graph.number_of_nodes(), "edges": graph.number_of_edges()})
+
+# Snapshots só são lidos de dentro do diretório de trabalho do servidor
+def initialize_snapshot(snapshot_path):
+    path = Path(str(snapshot_path)).resolve()
+    if Path.cwd().resolve() not in path.parents:
+        return jsonify({"error": "Snapshot fora do diretório do servidor."}), 400
+    start_time = time.time()
+    try:
+        snapshot = GraphSnapshot.load(path)
+    except (OSError, ValueError) as e:
+        print(f"Erro ao abrir snapshot: {e}")
+        return jsonify({"error": f"Snapshot inválido: {e}"}), 400
+    graph_id, _ = graphs.register_snapshot(snapshot)
+    print(f"Snapshot {path.name} ({graph_id[:12]}) carregado em {time.time() - start_time:.3f}s")
+    return jsonify({"message": "Grafo inicializado com sucesso.", "graph_id": graph_id,
+                    "nodes": snapshot.node_count, "edges": snapshot.edge_count})
+
+# (algoritmo, problema) -> método do MetroSolver
+SOLVER_METHODS = {
+    ('forca_bruta', 'A'): 'bruteForce_solve_longest_path',
+    ('forca_bruta', 'B'): 'bruteForce_solve_dominating_set',
+    ('branch_and_bound', 'A'): 'branchBound_solve_longest_path',
+    ('branch_and_bound', 'B'): 'branchBound_solve_dominating_set',
+    ('bloco_corte', 'A'): 'blockCut_solve_longest_path',
+    ('heuristica', 'A'): 'greedy_solve_longest_path',
+    ('heuristica', 'B'): 'greedy_solve_dominating_set',
+    ('portfolio', 'A'): 'portfolio_solve_longest_path',
+    ('portfolio', 'B'): 'portfolio_solve_dominating_set',
+}
+
+# Buscas exatas que gravam checkpoint. O arquivo tem o nome da chave do
+# pedido (a mesma do cache de resultados): repetir o /run depois de reiniciar
+# o servidor retoma de onde parou.
+CHECKPOINT_SOLVERS = {('forca_bruta', 'A'), ('forca_bruta', 'B'), ('branch_and_bound', 'A'),
+                      ('branch_and_bound', 'B')}
+CHECKPOINT_DIR = Path("checkpoints")
+
+# Cada job grava o arquivo de saída do solver na sua própria pasta; com o
+# nome padrão do método, jobs simultâneos escreveriam no mesmo arquivo.
+JOB_OUTPUT_DIR = Path("resultados_jobs")
+
+def run_solver(solver, problem, algorithm, params, cancel_token=None, progress=None, report=None, output_file=None):
+    method_name = SOLVER_METHODS.get((algorithm, problem))
+    if method_name is None:
+        raise ValueError(f"Combinação inválida: problema {problem}, algoritmo {algorithm}")
+    kwargs = {"cancel_token": cancel_token, "progress": progress, "report": report,
+              "time_budget": params.get('time_budget')}
+    if output_file is not None:
+        kwargs["output_file"] = str(output_file)
+    if algorithm == 'branch_and_bound':
+        # incumbente do guloso por padrão; false desliga, uma lista de estações é usada como está
+        kwargs["warm_start"] = params.get('warm_start', True)
+    if algorithm == 'portfolio':
+        kwargs["engines"] = params.get('engines')
+    if (algorithm, problem) in (('branch_and_bound', 'A'), ('forca_bruta', 'B')):
+        kwargs["workers"] = params.get('workers', 1)
+    elif problem == 'B' and algorithm in ('branch_and_bound', 'portfolio'):
+        kwargs["bounds"] = params.get('bounds')
+    if params.get('checkpoint'):
+        CHECKPOINT_DIR.mkdir(exist_ok=True)
+        key = results_cache.key(params.get('graph_id'), problem, algorithm, params)
+        kwargs.update(checkpoint=str(CHECKPOINT_DIR / f"{key}.json"), resume=True,
+                      checkpoint_interval=params.get('checkpoint_interval', 60.0))
+    return getattr(solver, method_name)(**kwargs)
+
+# Cache de resultados endereçado pelo conteúdo: a chave é o hash do grafo mais
+# problema, algoritmo e parâmetros que mudam a resposta. Memória em LRU e disco
+# em um JSON por chave, que sobrevive a reinícios. Só guarda execuções
+# completas (sem tempo esgotado), que são reprodutíveis.
+class ResultCache:
+    IGNORED_PARAMS = ("graph_id", "problem", "algorithm", "time_budget", "workers", "no_cache", "checkpoint",
+                      "checkpoint_interval")
+
+    def __init__(self, capacity=128, directory="cache_resultados", max_disk_entries=1024):
+        self.capacity = capacity
+        self.directory = Path(directory) if directory else None
+        self.max_disk_entries = max_disk_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+        self.stores = 0
+
+    def key(self, graph_hash, problem, algorithm, params):
+        relevant = {name: value for name, value in params.items() if name not in self.IGNORED_PARAMS}
+        payload = json.dumps([graph_hash, problem, algorithm, relevant], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry
+        entry = self._read_disk(key)
+        with self.lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits["disk"] += 1
+            self._remember(key, entry)
+        return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self._remember(key, entry)
+            self.stores += 1
+        self._write_disk(key, entry)
+
+    def stats(self):
+        with self.lock:
+            hits = self.hits["memory"] + self.hits["disk"]
+            lookups = hits + self.misses
+            disk_files = list(self.directory.glob("*.json")) if self.directory and self.directory.exists() else []
+            return {
+                "memory_hits": self.hits["memory"],
+                "disk_hits": self.hits["disk"],
+                "misses": self.misses,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "memory_entries": len(self.entries),
+                "memory_capacity": self.capacity,
+                "disk_entries": len(disk_files),
+                "disk_bytes": sum(path.stat().st_size for path in disk_files),
+            }
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def _read_disk(self, key):
+        if self.directory is None:
+            return None
+        path = self.directory / f"{key}.json"
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            # a remoção em _write_disk é pelo mtime: tocar o arquivo na leitura
+            # faz dela LRU e não FIFO
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def _write_disk(self, key, entry):
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # grava em arquivo temporário e renomeia: leitores nunca veem JSON pela metade
+            tmp_path = self.directory / f"{key}.{uuid.uuid4().hex}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.directory / f"{key}.json")
+            files = sorted(self.directory.glob("*.json"), key=lambda path: path.stat().st_mtime)
+            for path in files[:max(0, len(files) - self.max_disk_entries)]:
+                path.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Erro ao gravar cache em disco: {e}")
+
+class SolverJob:
+    def __init__(self, job_id, solver, problem, algorithm, params, cache_key=None):
+        self.job_id = job_id
+        self.solver = solver
+        self.problem = problem
+        self.algorithm = algorithm
+        self.params = params
+        self.token = CancellationToken()
+        self.channel = ProgressChannel()
+        self.report = {}
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.elapsed_time = None
+        self.future = None
+        self.cache_key = cache_key
+        self.cached = False
+        self.output_file = None
+
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+    def to_dict(self):
+        data = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "problem": self.problem,
+            "algorithm": self.algorithm,
+            "elapsed_time": self.elapsed_time,
+        }
+        if self.status == "done":
+            data["result"] = self.solver._serialize_result(self.result)
+            data["report"] = self.report
+            data["cached"] = self.cached
+        if self.output_file is not None:
+            data["output_file"] = str(self.output_file)
+        if self.error:
+            data["error"] = self.error
+        return data
+
+# Totais das execuções por (algoritmo, problema) para o /metrics, no formato
+# texto do Prometheus: contadores de execuções, nós, podas por motivo,
+# melhorias do incumbente e segundos por fase, mais um histograma de latência.
+class SolverStats:
+    BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.runs = defaultdict(int)
+        self.nodes = defaultdict(int)
+        self.prunes = defaultdict(int)
+        self.incumbents = defaultdict(int)
+        self.phase_seconds = defaultdict(float)
+        self.latency = defaultdict(lambda: [0] * len(self.BUCKETS))
+        self.latency_sum = defaultdict(float)
+        self.latency_count = defaultdict(int)
+
+    def observe(self, job):
+        key = (job.algorithm, job.problem)
+        metrics = job.report.get("metrics", {})
+        with self.lock:
+            self.runs[key + ("cached" if job.cached else job.status,)] += 1
+            if job.cached:
+                return
+            self.nodes[key] += metrics.get("nodes_expanded", 0)
+            self.incumbents[key] += len(metrics.get("incumbents", ()))
+            for reason, count in metrics.get("prunes", {}).items():
+                self.prunes[key + (reason,)] += count
+            for phase, seconds in metrics.get("phases", {}).items():
+                self.phase_seconds[key + (phase,)] += seconds
+            if job.elapsed_time is not None:
+                buckets = self.latency[key]
+                for i, upper in enumerate(self.BUCKETS):
+                    if job.elapsed_time <= upper:
+                        buckets[i] += 1
+                self.latency_sum[key] += job.elapsed_time
+                self.latency_count[key] += 1
+
+    def render(self, cache=None, job_manager=None):
+        lines = []
+
+        def family(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_prometheus_labels(labels)} {value}")
+
+        with self.lock:
+            family("metro_solver_runs_total", "counter", "Execuções de solver por status.",
+                   [({"algorithm": a, "problem": p, "status": st}, n) for (a, p, st), n in self.runs.items()])
+            family("metro_solver_nodes_expanded_total", "counter", "Nós expandidos pelos solvers.",
+                   [({"algorithm": a, "problem": p}, n) for (a, p), n in self.nodes.items()])
+            family("metro_solver_prunes_total", "counter", "Podas por motivo.",
+                   [({"algorithm": a, "problem": p, "reason": r}, n) for (a, p, r), n in self.prunes.items()])
+            family("metro_solver_incumbent_improvements_total", "counter", "Melhorias do incumbente.",
+                   [({"algorithm": a, "problem": p}, n) for (a, p), n in self.incumbents.items()])
+            family("metro_solver_phase_seconds_total", "counter", "Tempo gasto em cada fase dos solvers.",
+                   [({"algorithm": a, "problem": p, "phase": ph}, round(v, 6))
+                    for (a, p, ph), v in self.phase_seconds.items()])
+            samples = []
+            for key, buckets in self.latency.items():
+                labels = {"algorithm": key[0], "problem": key[1]}
+                for upper, count in zip(self.BUCKETS, buckets):
+                    samples.append(({**labels, "le": upper}, count))
+                samples.append(({**labels, "le": "+Inf"}, self.latency_count[key]))
+            lines.append("# HELP metro_solver_duration_seconds Latência das execuções de solver.")
+            lines.append("# TYPE metro_solver_duration_seconds histogram")
+            for labels, value in samples:
+                lines.append(f"metro_solver_duration_seconds_bucket{_prometheus_labels(labels)} {value}")
+            for (a, p), total in self.latency_sum.items():
+                labels = _prometheus_labels({"algorithm": a, "problem": p})
+                lines.append(f"metro_solver_duration_seconds_sum{labels} {round(total, 6)}")
+                lines.append(f"metro_solver_duration_seconds_count{labels} {self.latency_count[(a, p)]}")
+
+        if cache is not None:
+            stats = cache.stats()
+            family("metro_result_cache_hits_total", "counter", "Acertos do cache de resultados.",
+                   [({"tier": "memory"}, stats["memory_hits"]), ({"tier": "disk"}, stats["disk_hits"])])
+            family("metro_result_cache_misses_total", "counter", "Falhas do cache de resultados.",
+                   [({}, stats["misses"])])
+            family("metro_result_cache_entries", "gauge", "Entradas no cache de resultados.",
+                   [({"tier": "memory"}, stats["memory_entries"]), ({"tier": "disk"}, stats["disk_entries"])])
+        if job_manager is not None:
+            family("metro_jobs", "gauge", "Jobs conhecidos por status.",
+                   [({"status": st}, n) for st, n in job_manager.status_counts().items()])
+        return "\n".join(lines) + "\n"
+
+def _prometheus_labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for value in labels.values())
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + "}"
+
+# Pedido com checkpoint cuja chave já é de um job em andamento: os dois
+# gravariam e retomariam o mesmo arquivo.
+class CheckpointInUse(Exception):
+    def __init__(self, job):
+        super().__init__(f"Checkpoint em uso pelo job {job.job_id}.")
+        self.job = job
+
+# Executa os solvers fora da thread da requisição. Mantém os últimos max_jobs
+# jobs; os mais antigos já terminados são descartados junto com a pasta de
+# saída. Cada chave de checkpoint pertence a no máximo um job não terminado.
+class JobManager:
+    def __init__(self, max_workers=4, max_jobs=256, cache=None, stats=None):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.cache = cache
+        self.stats = stats
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        self.checkpoint_jobs = {}
+        self.lock = threading.Lock()
+
+    def submit(self, solver, problem, algorithm, params, cache_key=None, checkpoint_key=None):
+        job = SolverJob(uuid.uuid4().hex, solver, problem, algorithm, params, cache_key)
+        cached = self.cache.get(cache_key) if self.cache is not None and cache_key else None
+        with self.lock:
+            if checkpoint_key is not None and cached is None:
+                owner = self.checkpoint_jobs.get(checkpoint_key)
+                if owner is not None and not owner.finished():
+                    raise CheckpointInUse(owner)
+                self.checkpoint_jobs[checkpoint_key] = job
+            self.jobs[job.job_id] = job
+            self._evict()
+        if cached is not None:
+            job.result = cached["result"]
+            job.report = cached["report"]
+            job.elapsed_time = cached["elapsed_time"]
+            job.cached = True
+            job.status = "done"
+            if self.stats is not None:
+                self.stats.observe(job)
+            job.channel.close(**job.to_dict())
+            print(f"Job {job.job_id}: resultado servido do cache")
+            return job
+        job.future = self.executor.submit(self._run, job)
+        return job
+
+    def get(self, job_id):
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def status_counts(self):
+        with self.lock:
+            counts = defaultdict(int)
+            for job in self.jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job.token.cancel()
+        if job.future is not None and job.future.cancel():
+            job.status = "cancelled"
+            job.channel.close(**job.to_dict())
+        return job
+
+    def _evict(self):
+        for job_id in [key for key, job in self.jobs.items() if job.finished()]:
+            if len(self.jobs) <= self.max_jobs:
+                break
+            del self.jobs[job_id]
+            shutil.rmtree(JOB_OUTPUT_DIR / job_id, ignore_errors=True)
+
+    def _run(self, job):
+        if job.token.cancelled:
+            job.status = "cancelled"
+            job.channel.close(**job.to_dict())
+            return
+        job.status = "running"
+        print(f"Job {job.job_id}: problema {job.problem}, algoritmo {job.algorithm}")
+        start_time = time.time()
+        try:
+            output_dir = JOB_OUTPUT_DIR / job.job_id
+            output_dir.mkdir(parents=True, exist_ok=True)
+            job.output_file = output_dir / "resultado.txt"
+            job.result = run_solver(job.solver, job.problem, job.algorithm, job.params, job.token, job.channel,
+                                    job.report, job.output_file)
+            job.status = "done"
+        except SolverCancelled:
+            job.status = "cancelled"
+        except Exception as e:
+            print(f"Erro durante a execução: {e}")
+            job.error = str(e)
+            job.status = "failed"
+        job.elapsed_time = time.time() - start_time
+        if job.status == "done" and job.cache_key and self.cache is not None and not job.report.get("timed_out"):
+            self.cache.put(job.cache_key, {
+                "result": job.solver._serialize_result(job.result),
+                "report": job.report,
+                "elapsed_time": job.elapsed_time,
+            })
+        if self.stats is not None:
+            self.stats.observe(job)
+        with self.lock:
+            for key in [key for key, owner in self.checkpoint_jobs.items() if owner is job]:
+                del self.checkpoint_jobs[key]
+        job.channel.close(**job.to_dict())
+        print(f"Job {job.job_id} {job.status}, Tempo de execução: {job.elapsed_time}s")
+
+results_cache = ResultCache()
+solver_stats = SolverStats()
+jobs = JobManager(cache=results_cache, stats=solver_stats)
+
+# bool é subclasse de int (true viraria 1 segundo) e o JSON aceita NaN e Infinity
+def _positive_seconds(value):
+    return (isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+            and value > 0)
+
+@app.route('/run', methods=['POST'])
+def run_algorithm():
+    data = request.json
+    graph_id = data.get('graph_id')
+    solver = graphs.get(graph_id)
+    if solver is None:
+        print(f"Erro: grafo {graph_id} não encontrado.")
+        return jsonify({"error": "Grafo não encontrado; chame /initialize e envie o graph_id."}), 404
+
+    problem = data.get('problem')
+    algorithm = data.get('algorithm')
+
+    print(f"Recebido problema: {problem}, algoritmo: {algorithm}")
+    if (algorithm, problem) not in SOLVER_METHODS:
+        return jsonify({"error": f"Combinação inválida: problema {problem}, algoritmo {algorithm}"}), 400
+    time_budget = data.get('time_budget')
+    if time_budget is not None and not _positive_seconds(time_budget):
+        return jsonify({"error": "time_budget deve ser um número positivo de segundos."}), 400
+    workers = data.get('workers', 1)
+    max_workers = os.cpu_count() or 1
+    if isinstance(workers, bool) or not isinstance(workers, int) or not 1 <= workers <= max_workers:
+        return jsonify({"error": f"workers deve ser um inteiro de 1 a {max_workers}."}), 400
+    warm_start = data.get('warm_start', True)
+    if not isinstance(warm_start, bool) and not (isinstance(warm_start, list)
+                                                 and all(isinstance(name, str) for name in warm_start)):
+        return jsonify({"error": "warm_start deve ser true, false ou uma lista de estações."}), 400
+    if data.get('checkpoint') and (algorithm, problem) not in CHECKPOINT_SOLVERS:
+        return jsonify({"error": "checkpoint só vale para força bruta e branch and bound."}), 400
+    checkpoint_interval = data.get('checkpoint_interval', 60.0)
+    if not _positive_seconds(checkpoint_interval):
+        return jsonify({"error": "checkpoint_interval deve ser um número positivo de segundos."}), 400
+    engines = data.get('engines')
+    if algorithm == 'portfolio' and engines is not None and (
+            not isinstance(engines, list) or not engines
+            or any(engine not in MetroSolver.PORTFOLIO_ENGINES[problem] for engine in engines)):
+        return jsonify({"error": f"engines deve ser uma lista não vazia de: "
+                                 f"{', '.join(MetroSolver.PORTFOLIO_ENGINES[problem])}"}), 400
+
+    cache_key = results_cache.key(graph_id, problem, algorithm, data) if not data.get('no_cache') else None
+    # mesma chave que run_solver usa para o nome do arquivo de checkpoint
+    checkpoint_key = results_cache.key(graph_id, problem, algorithm, data) if data.get('checkpoint') else None
+    try:
+        job = jobs.submit(solver, problem, algorithm, data, cache_key, checkpoint_key)
+    except CheckpointInUse as e:
+        return jsonify({"error": "Já existe um job em andamento com este checkpoint.", "job_id": e.job.job_id}), 409
+    return jsonify(job.to_dict()), 200 if job.cached else 202
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(solver_stats.render(results_cache, jobs), mimetype="text/plain; version=0.0.4")
+
+@app.route('/cache', methods=['GET'])
+def cache_stats():
+    return jsonify(results_cache.stats())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job não encontrado."}), 404
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = jobs.cancel(job_id)
+    if job is None:
+        return jsonify({"error": "Job não encontrado."}), 404
+    return jsonify(job.to_dict())
+
+# Stream SSE dos eventos do job; termina com o evento "done" (status e resultado)
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": "Job não encontrado."}), 404
+
+    def generate():
+        for event in job.channel.subscribe():
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"data: {json.dumps(event)}\n\n"
+
+    return Response(generate(), content_type='text/event-stream')
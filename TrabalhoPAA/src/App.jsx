@@ -42,34 +42,62 @@ function parseLines(text) {
   return result;
 }
 
+function streamJob(jobId, onProgress) {
+  // Eventos do job via SSE: progresso, melhor solução parcial e o "done" final
+  return new Promise((resolve) => {
+    const eventSource = new EventSource(`http://localhost:5000/jobs/${jobId}/events`);
+    eventSource.onmessage = (event) => {
+      const data = JSON.parse(event.data);
+      if (data.type === 'progress') {
+        onProgress(data.progress);
+      } else if (data.type === 'incumbent') {
+        console.log('Melhor solução parcial:', data.value, data.solution);
+      } else if (data.type === 'done') {
+        eventSource.close();
+        resolve(data);
+      }
+    };
+  });
+}
+
 function App() {
   const [stations, setStations] = useState(null);
   const [lines, setLines] = useState(null);
   const [result, setResult] = useState('');
   const [progress, setProgress] = useState('');
   const [highlightedEdges, setHighlightedEdges] = useState([]);
+  const [graphId, setGraphId] = useState(null);
 
   const initializeGraph = async () => {
     try {
-      await axios.post('http://localhost:5000/initialize');
+      // Sem arquivos carregados o backend usa estacoes.txt e linhas.txt
+      const payload = stations && lines ? { stations, lines } : {};
+      const response = await axios.post('http://localhost:5000/initialize', payload);
+      setGraphId(response.data.graph_id);
       setProgress('Grafo inicializado com sucesso.');
     } catch (error) {
       console.error('Erro ao inicializar o grafo:', error);
     }
   };
 
-  const handleRun = async (problema, algoritmo) => {
+  const handleRun = async (problema, algoritmo, onProgress) => {
     setProgress('Executando algoritmo...');
     try {
-      const response = await axios.post('http://localhost:5000/run', {
+      const submitted = await axios.post('http://localhost:5000/run', {
+        graph_id: graphId,
         problem: problema,
         algorithm: algoritmo
       });
-      setResult(`Resultado: ${JSON.stringify(response.data.result)}\nTempo: ${response.data.elapsed_time}s`);
+      const job = await streamJob(submitted.data.job_id, onProgress);
+      if (job.status !== 'done') {
+        setProgress(job.status === 'cancelled' ? 'Execução cancelada.' : `Erro durante a execução: ${job.error}`);
+        return;
+      }
+      setResult(`Resultado: ${JSON.stringify(job.result)}\nTempo: ${job.elapsed_time}s`);
       setProgress('Execução concluída.');
 
       // Extract edges from the result and update highlightedEdges
-      const path = response.data.result;
+      const path = job.result;
       console.log('Algorithm result:', path);
       const edges = path.map((node, index) => {
         if (index < path.length - 1) {
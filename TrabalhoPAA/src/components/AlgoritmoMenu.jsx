@@ -8,29 +8,27 @@ export default function AlgoritmoMenu({ onRun }) {
     const [loading, setLoading] = useState(false);
     const [progress, setProgress] = useState(0);
 
+    // a decomposição em blocos só existe para o Problema A
+    const selecionarProblema = (valor) => {
+        setProblema(valor);
+        if (valor !== 'A' && algoritmo === 'bloco_corte') {
+            setAlgoritmo('forca_bruta');
+        }
+    };
+
     const handleRun = async () => {
         setLoading(true);
         setProgress(0);
 
-        const eventSource = new EventSource('http://localhost:5000/progress-updates');
-
-        eventSource.onmessage = (event) => {
-            console.log("Received progress update:", event.data);
-            const data = JSON.parse(event.data);
-            if (data.progress !== undefined) { // Allow 0 as a valid progress value
-                if (typeof data.progress === 'number') {
-                    setProgress(data.progress);
-                    console.log("Progress bar value:", data.progress);
+        try {
+            await onRun(problema, algoritmo, (value) => {
+                if (typeof value === 'number') {
+                    setProgress(value);
                 } else {
-                    console.error("Invalid progress data received:", data);
+                    console.error("Invalid progress data received:", value);
                 }
-            }
-        };
-
-        try {
-            await onRun(problema, algoritmo);
+            });
         } finally {
-            eventSource.close();
             setLoading(false);
         }
     };
@@ -42,7 +40,7 @@ export default function AlgoritmoMenu({ onRun }) {
                 <ButtonGroup variant="outlined" fullWidth>
                     <Tooltip title="Encontrar o número máximo de estações que um turista pode visitar">
                         <Button
-                            onClick={() => setProblema('A')}
+                            onClick={() => selecionarProblema('A')}
                             variant={problema === 'A' ? 'contained' : 'outlined'}
                             sx={{ flex: 1 }}
                         >
@@ -51,7 +49,7 @@ export default function AlgoritmoMenu({ onRun }) {
                     </Tooltip>
                     <Tooltip title="Determinar as estações para instalação de guichês">
                         <Button
-                            onClick={() => setProblema('B')}
+                            onClick={() => selecionarProblema('B')}
                             variant={problema === 'B' ? 'contained' : 'outlined'}
                             sx={{ flex: 1 }}
                         >
@@ -78,6 +76,15 @@ export default function AlgoritmoMenu({ onRun }) {
                     >
                         Branch and Bound
                     </Button>
+                    {problema === 'A' && (
+                        <Button
+                            onClick={() => setAlgoritmo('bloco_corte')}
+                            variant={algoritmo === 'bloco_corte' ? 'contained' : 'outlined'}
+                            fullWidth
+                        >
+                            Decomposição em Blocos
+                        </Button>
+                    )}
                     <Button
                         onClick={() => setAlgoritmo('heuristica')}
                         variant={algoritmo === 'heuristica' ? 'contained' : 'outlined'}
@@ -85,6 +92,15 @@ export default function AlgoritmoMenu({ onRun }) {
                     >
                         Heurística
                     </Button>
+                    <Tooltip title="Executa vários algoritmos em paralelo e fica com o primeiro que provar o ótimo">
+                        <Button
+                            onClick={() => setAlgoritmo('portfolio')}
+                            variant={algoritmo === 'portfolio' ? 'contained' : 'outlined'}
+                            fullWidth
+                        >
+                            Portfólio
+                        </Button>
+                    </Tooltip>
                 </Stack>
             </div>
 
@@ -0,0 +1,42 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+import networkx as nx
+
+from metro_core import MetroSolver
+
+
+# Checkpoint do branch and bound do conjunto dominante num grafo grande: as
+# bitmasks passam de 4300 dígitos decimais e precisam ir para o JSON como hex.
+class LargeGraphCheckpointTest(unittest.TestCase):
+    NODES = 15001
+
+    def run_solver(self, solver, **kwargs):
+        report = {}
+        with contextlib.redirect_stdout(io.StringIO()):
+            solver.branchBound_solve_dominating_set(output_file=os.devnull, bounds=["max_cover"], report=report,
+                                                    **kwargs)
+        return report
+
+    def test_save_and_resume_above_15k_stations(self):
+        graph = nx.relabel_nodes(nx.cycle_graph(self.NODES), lambda i: f"Estacao {i:05d}")
+        solver = MetroSolver(graph)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ck.json")
+            first = self.run_solver(solver, checkpoint=path, checkpoint_interval=0, time_budget=2)
+            self.assertTrue(first["timed_out"])
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)["state"]
+            self.assertTrue(saved["frames"])
+
+            second = self.run_solver(solver, checkpoint=path, checkpoint_interval=0, resume=True, time_budget=2)
+            self.assertGreater(second["search_count"], saved["search_count"])
+            self.assertLessEqual(second["value"], first["value"])
+
+
+if __name__ == "__main__":
+    unittest.main()